@@ -495,23 +495,27 @@ def delete_supplement_start(
     return {"status": "deleted", "id": start_id}
 
 
+# The library is static, so build the response once rather than per request
+_SUPPLEMENT_LIBRARY = {
+    "supplements": [
+        {"id": s[0], "name": s[1], "typical_dose": s[2], "unit": s[3]}
+        for s in SupplementStart.SUPPLEMENT_LIBRARY
+    ],
+    "frequencies": [
+        {"id": f[0], "name": f[1]}
+        for f in SupplementStart.FREQUENCIES
+    ],
+    "reasons": [
+        {"id": r[0], "name": r[1]}
+        for r in SupplementStart.REASONS
+    ]
+}
+
+
 @router.get("/supplement-library")
 def get_supplement_library():
     """Get the list of common supplements for manual entry."""
-    return {
-        "supplements": [
-            {"id": s[0], "name": s[1], "typical_dose": s[2], "unit": s[3]}
-            for s in SupplementStart.SUPPLEMENT_LIBRARY
-        ],
-        "frequencies": [
-            {"id": f[0], "name": f[1]}
-            for f in SupplementStart.FREQUENCIES
-        ],
-        "reasons": [
-            {"id": r[0], "name": r[1]}
-            for r in SupplementStart.REASONS
-        ]
-    }
+    return _SUPPLEMENT_LIBRARY
 
 
 # --- Life Event Endpoints ---
@@ -983,7 +987,7 @@ def get_correlation_insights(
 
     for supplement in active_supplements:
         supp_id = supplement.supplement_id
-        supp_name = supplement.supplement_name or supp_id.replace("_", " ").title()
+        supp_name = supplement.display_name
         days_taken = supplement_days.get(supp_id, set())
 
         if len(days_taken) < 5:
@@ -1206,7 +1210,7 @@ def get_supplement_insights(
 
     for supp_start in supplement_starts:
         supp_id = supp_start.supplement_id
-        supp_name = supp_start.supplement_name or supp_id.replace("_", " ").title()
+        supp_name = supp_start.display_name
         start_date_val = supp_start.start_date
         days_on = (date.today() - start_date_val).days
 
@@ -0,0 +1,13 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.config import get_settings
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Reject requests without the configured admin key before any DB work."""
+    expected = get_settings().admin_api_key
+    if not expected or not secrets.compare_digest(x_admin_key or "", expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
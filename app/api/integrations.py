@@ -1,16 +1,44 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import RedirectResponse
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 
+from app.config import get_settings
+from app.api.deps import require_admin_key
 from app.db import get_db
 from app.models import User, HealthData
 from app.integrations import OuraIntegration, WhoopIntegration, MockIntegration
+from app.integrations.oura import MAX_HISTORY_DAYS
 
 router = APIRouter()
 
+# Fields copied from an Oura historical row onto a HealthData record
+OURA_DAY_FIELDS = (
+    # Core metrics
+    "sleep_score", "hrv_score", "recovery_score", "strain_score",
+    # Sleep details
+    "sleep_duration_hrs", "deep_sleep_duration", "rem_sleep_duration", "light_sleep_duration",
+    "awake_duration", "sleep_efficiency", "sleep_latency", "restfulness_score",
+    "bedtime", "wake_time", "deep_sleep_pct", "rem_sleep_pct",
+    # Heart rate
+    "resting_hr", "lowest_hr", "average_hr_sleep",
+    # Heart health
+    "vo2_max",
+    # Activity
+    "activity_score", "steps", "active_calories", "total_calories", "sedentary_time", "active_time",
+    # SpO2 / Breathing
+    "spo2_average", "breathing_average", "breathing_regularity",
+    # Stress
+    "stress_level", "stress_score",
+    # Workout
+    "workout_type", "workout_duration", "workout_intensity", "workout_calories", "workout_source",
+    # Temperature
+    "temperature_deviation", "temperature_trend",
+)
+
 
 class OAuthStartResponse(BaseModel):
     auth_url: str
@@ -189,7 +217,7 @@ def disconnect_oura(user_id: str, db: Session = Depends(get_db)):
 @router.get("/{user_id}/oura/history")
 async def get_oura_history(
     user_id: str,
-    days: int = 7,
+    days: int = Query(7, ge=1, le=MAX_HISTORY_DAYS),
     db: Session = Depends(get_db)
 ):
     """
@@ -219,122 +247,42 @@ async def get_oura_history(
         historical = await oura.fetch_historical_data(user.oura_token, days=days)
 
         # Store each day's data as a separate record for analytics charting
+        # (skipping days with no meaningful data)
+        days_with_data = [
+            day for day in historical or []
+            if day.get("sleep_score") is not None or day.get("hrv_score") is not None or day.get("recovery_score") is not None
+        ]
         records_added = 0
-        if historical:
-            for day in historical:
-                # Skip days with no meaningful data
-                if day.get("sleep_score") is None and day.get("hrv_score") is None and day.get("recovery_score") is None:
-                    continue
-
-                # Parse the date and create a timestamp for that day
-                from datetime import datetime as dt
-                day_date = dt.strptime(day["date"], "%Y-%m-%d")
-
-                # Check if we already have data for this date
-                existing = db.query(HealthData).filter(
-                    HealthData.user_id == user_id,
-                    HealthData.source == "oura",
-                    HealthData.timestamp >= day_date,
-                    HealthData.timestamp < day_date + timedelta(days=1)
-                ).first()
-
+        if days_with_data:
+            day_dates = [datetime.strptime(day["date"], "%Y-%m-%d") for day in days_with_data]
+
+            # Load the existing Oura records for the whole range in one query
+            # rather than one lookup per day
+            existing_by_day = {}
+            for record in db.query(HealthData).filter(
+                HealthData.user_id == user_id,
+                HealthData.source == "oura",
+                HealthData.timestamp >= min(day_dates),
+                HealthData.timestamp < max(day_dates) + timedelta(days=1)
+            ):
+                existing_by_day.setdefault(record.timestamp.date(), record)
+
+            new_rows = []
+            for day, day_date in zip(days_with_data, day_dates):
+                values = {field: day.get(field) for field in OURA_DAY_FIELDS}
+                existing = existing_by_day.get(day_date.date())
                 if existing:
                     # Update existing record with all new fields
-                    existing.sleep_score = day.get("sleep_score")
-                    existing.hrv_score = day.get("hrv_score")
-                    existing.recovery_score = day.get("recovery_score")
-                    existing.strain_score = day.get("strain_score")
-                    existing.sleep_duration_hrs = day.get("sleep_duration_hrs")
-                    existing.deep_sleep_duration = day.get("deep_sleep_duration")
-                    existing.rem_sleep_duration = day.get("rem_sleep_duration")
-                    existing.light_sleep_duration = day.get("light_sleep_duration")
-                    existing.awake_duration = day.get("awake_duration")
-                    existing.sleep_efficiency = day.get("sleep_efficiency")
-                    existing.sleep_latency = day.get("sleep_latency")
-                    existing.restfulness_score = day.get("restfulness_score")
-                    existing.bedtime = day.get("bedtime")
-                    existing.wake_time = day.get("wake_time")
-                    existing.deep_sleep_pct = day.get("deep_sleep_pct")
-                    existing.rem_sleep_pct = day.get("rem_sleep_pct")
-                    existing.resting_hr = day.get("resting_hr")
-                    existing.lowest_hr = day.get("lowest_hr")
-                    existing.average_hr_sleep = day.get("average_hr_sleep")
-                    existing.vo2_max = day.get("vo2_max")
-                    existing.activity_score = day.get("activity_score")
-                    existing.steps = day.get("steps")
-                    existing.active_calories = day.get("active_calories")
-                    existing.total_calories = day.get("total_calories")
-                    existing.sedentary_time = day.get("sedentary_time")
-                    existing.active_time = day.get("active_time")
-                    existing.spo2_average = day.get("spo2_average")
-                    existing.breathing_average = day.get("breathing_average")
-                    existing.breathing_regularity = day.get("breathing_regularity")
-                    existing.stress_level = day.get("stress_level")
-                    existing.stress_score = day.get("stress_score")
-                    existing.workout_type = day.get("workout_type")
-                    existing.workout_duration = day.get("workout_duration")
-                    existing.workout_intensity = day.get("workout_intensity")
-                    existing.workout_calories = day.get("workout_calories")
-                    existing.workout_source = day.get("workout_source")
-                    existing.temperature_deviation = day.get("temperature_deviation")
-                    existing.temperature_trend = day.get("temperature_trend")
+                    for field, value in values.items():
+                        setattr(existing, field, value)
                 else:
-                    # Create new record for this day
-                    health_data = HealthData(
-                        user_id=user_id,
-                        source="oura",
-                        timestamp=day_date,
-                        # Core metrics
-                        sleep_score=day.get("sleep_score"),
-                        hrv_score=day.get("hrv_score"),
-                        recovery_score=day.get("recovery_score"),
-                        strain_score=day.get("strain_score"),
-                        # Sleep details
-                        sleep_duration_hrs=day.get("sleep_duration_hrs"),
-                        deep_sleep_duration=day.get("deep_sleep_duration"),
-                        rem_sleep_duration=day.get("rem_sleep_duration"),
-                        light_sleep_duration=day.get("light_sleep_duration"),
-                        awake_duration=day.get("awake_duration"),
-                        sleep_efficiency=day.get("sleep_efficiency"),
-                        sleep_latency=day.get("sleep_latency"),
-                        restfulness_score=day.get("restfulness_score"),
-                        bedtime=day.get("bedtime"),
-                        wake_time=day.get("wake_time"),
-                        deep_sleep_pct=day.get("deep_sleep_pct"),
-                        rem_sleep_pct=day.get("rem_sleep_pct"),
-                        # Heart rate
-                        resting_hr=day.get("resting_hr"),
-                        lowest_hr=day.get("lowest_hr"),
-                        average_hr_sleep=day.get("average_hr_sleep"),
-                        # Heart health
-                        vo2_max=day.get("vo2_max"),
-                        # Activity
-                        activity_score=day.get("activity_score"),
-                        steps=day.get("steps"),
-                        active_calories=day.get("active_calories"),
-                        total_calories=day.get("total_calories"),
-                        sedentary_time=day.get("sedentary_time"),
-                        active_time=day.get("active_time"),
-                        # SpO2 / Breathing
-                        spo2_average=day.get("spo2_average"),
-                        breathing_average=day.get("breathing_average"),
-                        breathing_regularity=day.get("breathing_regularity"),
-                        # Stress
-                        stress_level=day.get("stress_level"),
-                        stress_score=day.get("stress_score"),
-                        # Workout
-                        workout_type=day.get("workout_type"),
-                        workout_duration=day.get("workout_duration"),
-                        workout_intensity=day.get("workout_intensity"),
-                        workout_calories=day.get("workout_calories"),
-                        workout_source=day.get("workout_source"),
-                        # Temperature
-                        temperature_deviation=day.get("temperature_deviation"),
-                        temperature_trend=day.get("temperature_trend"),
-                    )
-                    db.add(health_data)
-                    records_added += 1
+                    new_rows.append({"user_id": user_id, "source": "oura", "timestamp": day_date, **values})
 
+            # New days go in as one batched INSERT instead of a flush per object
+            if new_rows:
+                # render_nulls keeps every row's column set identical so they batch together
+                db.execute(insert(HealthData).execution_options(render_nulls=True), new_rows)
+            records_added = len(new_rows)
             db.commit()
 
         return {
@@ -410,7 +358,7 @@ async def sync_health_data(user_id: str, db: Session = Depends(get_db)):
                 db.commit()
 
             # Fetch historical data to get most recent non-null values
-            historical = await oura.fetch_historical_data(user.oura_token, days=7)
+            historical = await oura.fetch_historical_data(user.oura_token, days=7, include_activity=False)
 
             # Build combined data using most recent non-null values
             combined = {
@@ -611,7 +559,6 @@ async def add_mock_history(
     }
 
 
-@router.get("/{user_id}/oura/debug")
 async def debug_oura_data(user_id: str, db: Session = Depends(get_db)):
     """
     Debug endpoint to see raw Oura API responses.
@@ -684,6 +631,13 @@ async def debug_oura_data(user_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Debug failed: {str(e)}")
 
 
+# Makes live Oura calls and returns raw payloads; only registered when enabled
+if get_settings().debug_endpoints_enabled:
+    router.get(
+        "/{user_id}/oura/debug", dependencies=[Depends(require_admin_key)], include_in_schema=False
+    )(debug_oura_data)
+
+
 @router.post("/{user_id}/simulate-oura")
 def simulate_oura_connection(
     user_id: str,
@@ -124,8 +124,8 @@ async def get_adjusted_dose(
 
     Pass user profile parameters to get adjusted dosing.
     """
-    from app.engine.rules import RulesEngine
-    rules = RulesEngine()
+    from app.engine.rules import get_rules_engine
+    rules = get_rules_engine()
 
     config = rules.supplements.get(supplement_id)
     if not config:
@@ -255,8 +255,8 @@ async def list_supplement_info():
     """
     Get all supplement information including cycling and interaction data.
     """
-    from app.engine.rules import RulesEngine
-    rules = RulesEngine()
+    from app.engine.rules import get_rules_engine
+    rules = get_rules_engine()
 
     supplements_info = []
 
@@ -270,8 +270,8 @@ async def list_supplement_info():
             "standard_dose": config.standard_dose,
             "max_daily_dose": config.max_daily_dose,
             "time_windows": config.time_windows,
-            "triggers": list(config.triggers.keys()),
-            "contraindications": config.contraindications,
+            "triggers": list(config.triggers),
+            "contraindications": sorted(config.contraindications),
             "evidence": config.evidence,
             "has_cycle_protocol": cycle_protocol is not None,
             "cycle_protocol": {
@@ -8,13 +8,13 @@ from pydantic import BaseModel
 from app.db import get_db
 from app.models import User, HealthData, DispenseLog, CustomBlend
 from app.engine.mixes import mix_engine, SUPPLEMENT_MIXES
-from app.engine.rules import RulesEngine
+from app.engine.rules import get_rules_engine
 from app.engine.interactions import interaction_checker
 from app.engine.llm import llm_personalizer
 
 router = APIRouter()
 blends_router = APIRouter()  # Separate router for custom blends (needs to be registered first)
-rules = RulesEngine()
+rules = get_rules_engine()
 
 
 class MixSupplement(BaseModel):
@@ -10,7 +10,15 @@ class Settings(BaseSettings):
     oura_client_secret: str = ""
     whoop_client_id: str = ""
     whoop_client_secret: str = ""
+    # Must match the redirect URI registered with the Oura app
+    oura_redirect_uri: str = "https://health-platform-production-94aa.up.railway.app/api/oura/callback"
     database_url: str = "sqlite:///./health_platform.db"
+    # Create missing tables on startup; turn off where the schema is managed at deploy time
+    auto_create_tables: bool = True
+    # Register debug routes that hit live third-party APIs; keep off in production
+    debug_endpoints_enabled: bool = False
+    # Shared secret for admin routes (sent as X-Admin-Key); admin routes are disabled while empty
+    admin_api_key: str = ""
 
 
 
@@ -391,6 +391,10 @@ class InteractionChecker:
         Returns:
             List of Interaction objects for any found interactions
         """
+        # Interactions are pairwise, so a lone supplement can't interact with anything
+        if len(supplements) < 2 and not user_medications:
+            return []
+
         found_interactions = []
         medications = user_medications or []
 
@@ -665,9 +669,8 @@ class InteractionChecker:
         # Get dose adjustments
         if user_profile:
             for supp_id in supplements:
-                from app.engine.rules import RulesEngine
-                rules = RulesEngine()
-                config = rules.supplements.get(supp_id)
+                from app.engine.rules import get_rules_engine
+                config = get_rules_engine().supplements.get(supp_id)
                 if config:
                     adjustment = self.get_adjusted_dose(
                         supp_id,
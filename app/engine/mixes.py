@@ -283,10 +283,10 @@ class MixEngine:
     """Engine for generating personalized supplement mixes."""
 
     def __init__(self):
-        from app.engine.rules import RulesEngine
+        from app.engine.rules import get_rules_engine
         from app.engine.interactions import interaction_checker
 
-        self.rules = RulesEngine()
+        self.rules = get_rules_engine()
         self.interactions = interaction_checker
         self.mixes = SUPPLEMENT_MIXES
 
@@ -3,7 +3,7 @@ from typing import Optional, Dict
 from sqlalchemy.orm import Session
 
 from app.models import User, HealthData, DispenseLog, DailyCheckIn
-from .rules import RulesEngine
+from .rules import get_rules_engine
 from .llm import LLMPersonalizer
 from .interactions import interaction_checker
 from .dynamic_intelligence import dynamic_intelligence, SupplementAdjustment
@@ -13,7 +13,7 @@ class RecommendationEngine:
     """Main recommendation engine combining rules, dynamic intelligence, and LLM personalization."""
 
     def __init__(self):
-        self.rules = RulesEngine()
+        self.rules = get_rules_engine()
         self.llm = LLMPersonalizer()
         self.intelligence = dynamic_intelligence
 
@@ -52,10 +52,13 @@ class RecommendationEngine:
         # Step 5: Get what's been dispensed today
         dispensed_today = self._get_dispensed_today(user.id, db)
 
+        # Hashed once and reused by every contraindication check below
+        allergies = frozenset(user.allergies or ())
+
         # Step 6: Get available supplements (filtered by rules)
         available = self.rules.get_available_supplements(
             time_of_day=time_of_day,
-            user_allergies=user.allergies or [],
+            user_allergies=allergies,
             dispensed_today=dispensed_today
         )
 
@@ -119,7 +122,7 @@ class RecommendationEngine:
                 "unit": supp.unit,
                 "standard_dose": supp.standard_dose,
                 "remaining_dose": remaining,
-                "triggers": list(supp.triggers.keys()),
+                "triggers": list(supp.triggers),
                 "dynamic_adjustment": self._get_dynamic_adjustment_info(dyn_adj) if dyn_adj else None
             })
 
@@ -132,6 +135,9 @@ class RecommendationEngine:
             time_of_day=time_of_day
         )
 
+        # Active triggers per supplement, for the explanations below
+        triggers_by_supplement = self.rules.get_triggers_by_supplement(active_triggers)
+
         # Step 10: Validate and finalize recommendations
         validated_recommendations = []
         for rec in llm_result.get("recommendations", []):
@@ -142,7 +148,7 @@ class RecommendationEngine:
                 supplement_id=supplement_id,
                 dose=dose,
                 time_of_day=time_of_day,
-                user_allergies=user.allergies or [],
+                user_allergies=allergies,
                 dispensed_today=dispensed_today
             )
 
@@ -173,11 +179,10 @@ class RecommendationEngine:
 
                 # Build detailed explanation
                 matched_triggers = []
-                for trigger_name, is_active in active_triggers.items():
-                    if is_active and config.triggers.get(trigger_name, False):
-                        trigger_explanation = self.rules.get_trigger_explanation(trigger_name, health_data)
-                        if trigger_explanation:
-                            matched_triggers.append(trigger_explanation)
+                for trigger_name in triggers_by_supplement.get(supplement_id, ()):
+                    trigger_explanation = self.rules.get_trigger_explanation(trigger_name, health_data)
+                    if trigger_explanation:
+                        matched_triggers.append(trigger_explanation)
 
                 # Get dynamic intelligence info if available
                 dyn_adj = dynamic_adjustments.get(supplement_id)
@@ -222,7 +227,7 @@ class RecommendationEngine:
                     supplement_id=adj.supplement_id,
                     dose=config.standard_dose * adj.dose_multiplier,
                     time_of_day=time_of_day,
-                    user_allergies=user.allergies or [],
+                    user_allergies=allergies,
                     dispensed_today=dispensed_today
                 )
 
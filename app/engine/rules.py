@@ -1,26 +1,158 @@
-import json
+import operator
+import sys
+import time
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, date
-from typing import Optional, List, Dict, Tuple
+from types import MappingProxyType
+from typing import Optional, List, Dict, Tuple, FrozenSet, Callable, Collection, Mapping, Union
 from dataclasses import dataclass
 
+import orjson
+
 from app.engine.interactions import interaction_checker
 
 
-@dataclass
+# Metric ids used by the trigger tables
+METRIC_NAMES = (
+    "sleep_score", "hrv_score", "recovery_score", "strain_score", "sleep_duration_hrs",
+    "temperature_deviation", "composite", "default", "user_reported",
+)
+(
+    METRIC_SLEEP, METRIC_HRV, METRIC_RECOVERY, METRIC_STRAIN, METRIC_SLEEP_DURATION,
+    METRIC_TEMPERATURE, METRIC_COMPOSITE, METRIC_DEFAULT, METRIC_USER_REPORTED,
+) = range(len(METRIC_NAMES))
+
+# Population (fixed) threshold rules: (trigger, metric id, comparison, threshold),
+# in the order triggers are reported. The composite metric is sleep + recovery,
+# so its threshold is twice the average (60).
+FIXED_THRESHOLD_RULES = (
+    ("poor_sleep", METRIC_SLEEP, operator.lt, 60),
+    ("poor_sleep_quality", METRIC_SLEEP, operator.lt, 65),
+    ("poor_sleep_onset", METRIC_SLEEP, operator.lt, 55),
+    ("low_sleep_score", METRIC_SLEEP, operator.lt, 60),
+    ("sleep_optimization", METRIC_SLEEP, operator.lt, 80),
+    ("fatigue", METRIC_SLEEP_DURATION, operator.lt, 6),
+    ("low_hrv", METRIC_HRV, operator.lt, 50),
+    ("high_stress", METRIC_HRV, operator.lt, 45),
+    ("poor_recovery", METRIC_RECOVERY, operator.lt, 55),
+    ("recovery_needed", METRIC_RECOVERY, operator.lt, 60),
+    ("muscle_recovery", METRIC_RECOVERY, operator.lt, 70),
+    ("high_strain", METRIC_STRAIN, operator.gt, 70),
+    ("dehydration", METRIC_STRAIN, operator.gt, 75),
+    ("low_energy", METRIC_COMPOSITE, operator.lt, 120),
+    ("high_inflammation", METRIC_STRAIN, operator.gt, 60),
+)
+
+# Active triggers as either a name -> is_active mapping or the active names alone
+ActiveTriggers = Union[Mapping[str, bool], Collection[str]]
+
+DEFAULT_BEDTIME_HOUR = 22
+
+# Immutable defaults so the common no-allergies / nothing-dispensed calls allocate nothing
+_NO_ALLERGIES: FrozenSet[str] = frozenset()
+_NOTHING_DISPENSED: Mapping[str, float] = MappingProxyType({})
+
+
+def _matched_trigger_count(match: Tuple["SupplementConfig", List[str]]) -> int:
+    """Sort key for (supplement, matched triggers) pairs."""
+    return len(match[1])
+
+
+def _mean_and_std(stats: dict) -> Tuple[Optional[float], Optional[float]]:
+    """Extract (mean, std) from a baseline metric entry."""
+    return stats.get("mean"), stats.get("std")
+
+
+def _is_significantly_low(current, mean, std) -> bool:
+    """Check if current value is significantly below personal baseline."""
+    if current is None or mean is None:
+        return False
+    if std is None or std == 0:
+        # No variance data, use 15% threshold
+        return current < (mean * 0.85)
+    # More than 1 std deviation below mean
+    return current < (mean - std)
+
+
+def _is_significantly_high(current, mean, std) -> bool:
+    """Check if current value is significantly above personal baseline."""
+    if current is None or mean is None:
+        return False
+    if std is None or std == 0:
+        return current > (mean * 1.15)
+    return current > (mean + std)
+
+
+@lru_cache(maxsize=256)
+def _parse_bedtime_hour(user_bedtime: Optional[str]) -> int:
+    """Parse the hour from a "HH:MM" bedtime, falling back to 22:00 / 10pm."""
+    if user_bedtime:
+        try:
+            return int(user_bedtime.split(":")[0])
+        except (ValueError, IndexError):
+            pass
+    return DEFAULT_BEDTIME_HOUR
+
+
+def _time_of_day_for(hour: int, bedtime_hour: int) -> str:
+    """Classify an hour given the user's bedtime hour."""
+    # Bedtime window starts 1 hour before actual bedtime
+    bedtime_start = bedtime_hour - 1
+    if bedtime_start < 0:
+        bedtime_start = 23
+
+    if 5 <= hour < 12:
+        return "morning"
+    elif 12 <= hour < bedtime_start:
+        return "afternoon"
+    else:
+        return "bedtime"
+
+
+# [bedtime hour][hour] -> time of day, for every in-range combination
+_TIME_OF_DAY_BY_BEDTIME = tuple(
+    tuple(_time_of_day_for(hour, bedtime_hour) for hour in range(24))
+    for bedtime_hour in range(24)
+)
+
+
+@dataclass(frozen=True, slots=True)
 class SupplementConfig:
-    """Configuration for a single supplement."""
+    """Configuration for a single supplement (immutable, shared across requests)."""
     id: str
     name: str
     unit: str
     max_daily_dose: float
     standard_dose: float
-    time_windows: List[str]
-    triggers: Dict[str, bool]
-    contraindications: List[str]
+    time_windows: Tuple[str, ...]
+    triggers: Tuple[str, ...]  # Names of the triggers this supplement responds to
+    contraindications: FrozenSet[str]
     evidence: str = ""
     research: Optional[Dict] = None  # Research citations with pubmed_id, finding, mechanism
 
+    @classmethod
+    def from_json(cls, data: dict) -> "SupplementConfig":
+        """
+        Build a config from a supplements.json entry.
+
+        Contraindications are frozen so the allergy check is a single set
+        intersection; time windows stay ordered since they are displayed.
+        Only enabled triggers are kept. Identifiers drawn from a small
+        vocabulary are interned so comparisons are mostly identity checks.
+        """
+        return cls(
+            sys.intern(data["id"]),
+            data["name"],
+            sys.intern(data["unit"]),
+            data["max_daily_dose"],
+            data["standard_dose"],
+            tuple(sys.intern(window) for window in data["time_windows"]),
+            tuple(sys.intern(name) for name, enabled in data["triggers"].items() if enabled),
+            frozenset(sys.intern(c) for c in data["contraindications"]),
+            data.get("evidence", ""),
+            data.get("research"),
+        )
+
 
 class RulesEngine:
     """Rule-based safety layer for supplement recommendations."""
@@ -28,17 +160,69 @@ class RulesEngine:
     def __init__(self, supplements_path: str = None):
         if supplements_path is None:
             supplements_path = Path(__file__).parent.parent.parent / "supplements.json"
-        self.supplements = self._load_supplements(supplements_path)
+        self.supplements, self._by_time_of_day, self._by_trigger = _load_supplement_tables(
+            str(Path(supplements_path).resolve())
+        )
+        self._collect_matches = self._compile_matcher(self._by_trigger)
 
-    def _load_supplements(self, path: str) -> Dict[str, SupplementConfig]:
+    @staticmethod
+    def _load_supplements(path: str) -> Dict[str, SupplementConfig]:
         """Load supplement configurations from JSON."""
-        with open(path, "r") as f:
-            data = json.load(f)
+        data = orjson.loads(Path(path).read_bytes())
+
+        from_json = SupplementConfig.from_json
+        return {s["id"]: from_json(s) for s in data["supplements"]}
+
+    @staticmethod
+    def _bucket_by_time_of_day(
+        supplements: Dict[str, SupplementConfig]
+    ) -> Dict[str, Tuple[SupplementConfig, ...]]:
+        """Group supplements by the time windows they can be dispensed in."""
+        buckets: Dict[str, List[SupplementConfig]] = {}
+        for config in supplements.values():
+            if config.max_daily_dose <= 0:
+                continue  # Never dispensable, even with nothing dispensed yet
+            for window in config.time_windows:
+                buckets.setdefault(window, []).append(config)
+        return {window: tuple(configs) for window, configs in buckets.items()}
+
+    @staticmethod
+    def _index_by_trigger(supplements: Dict[str, SupplementConfig]) -> Dict[str, Tuple[str, ...]]:
+        """Build an inverted index of trigger name -> ids of supplements it activates."""
+        index: Dict[str, List[str]] = {}
+        for config in supplements.values():
+            for trigger_name in config.triggers:
+                index.setdefault(trigger_name, []).append(config.id)
+        return {trigger_name: tuple(ids) for trigger_name, ids in index.items()}
+
+    @staticmethod
+    def _compile_matcher(
+        by_trigger: Dict[str, Tuple[str, ...]]
+    ) -> Callable[[ActiveTriggers], Dict[str, List[str]]]:
+        """
+        Specialize trigger matching to a loaded supplement table.
+
+        The returned closure maps active triggers to {supplement_id: [trigger, ...]}
+        with the index lookup pre-bound, so the per-call work is just the
+        walk over active triggers.
+        """
+        lookup = by_trigger.get
+        no_supplements = ()
+
+        def collect_matches(active_triggers: ActiveTriggers) -> Dict[str, List[str]]:
+            if isinstance(active_triggers, Mapping):
+                active_triggers = [name for name, is_active in active_triggers.items() if is_active]
+
+            matched: Dict[str, List[str]] = {}
+            for trigger_name in active_triggers:
+                for supplement_id in lookup(trigger_name, no_supplements):
+                    if supplement_id in matched:
+                        matched[supplement_id].append(trigger_name)
+                    else:
+                        matched[supplement_id] = [trigger_name]
+            return matched
 
-        supplements = {}
-        for s in data["supplements"]:
-            supplements[s["id"]] = SupplementConfig(**s)
-        return supplements
+        return collect_matches
 
     def get_time_of_day(self, hour: int = None, user_bedtime: str = None) -> str:
         """
@@ -54,54 +238,39 @@ class RulesEngine:
             user_bedtime: User's bedtime in "HH:MM" format (default "22:00")
         """
         if hour is None:
-            hour = datetime.now().hour
-
-        # Parse user's bedtime (default 22:00 / 10pm)
-        bedtime_hour = 22
-        if user_bedtime:
-            try:
-                bedtime_hour = int(user_bedtime.split(":")[0])
-            except (ValueError, IndexError):
-                pass
-
-        # Bedtime window starts 1 hour before actual bedtime
-        bedtime_start = bedtime_hour - 1
-        if bedtime_start < 0:
-            bedtime_start = 23
-
-        if 5 <= hour < 12:
-            return "morning"
-        elif 12 <= hour < bedtime_start:
-            return "afternoon"
-        else:
-            return "bedtime"
+            hour = time.localtime().tm_hour
+
+        bedtime_hour = _parse_bedtime_hour(user_bedtime)
+
+        if 0 <= hour < 24 and 0 <= bedtime_hour < 24:
+            return _TIME_OF_DAY_BY_BEDTIME[bedtime_hour][hour]
+
+        # Out-of-range override hours or bedtimes are classified directly
+        return _time_of_day_for(hour, bedtime_hour)
 
     def get_available_supplements(
         self,
         time_of_day: str,
-        user_allergies: List[str] = None,
-        dispensed_today: Dict[str, float] = None
+        user_allergies: Collection[str] = _NO_ALLERGIES,
+        dispensed_today: Mapping[str, float] = _NOTHING_DISPENSED
     ) -> List[SupplementConfig]:
         """Get supplements available for dispensing based on rules."""
-        if user_allergies is None:
-            user_allergies = []
-        if dispensed_today is None:
-            dispensed_today = {}
+        # Only supplements allowed in this time window are considered
+        candidates = self._by_time_of_day.get(time_of_day, ())
+        if not user_allergies and not dispensed_today:
+            return list(candidates)
 
+        allergies = frozenset(user_allergies)
+        get_dispensed = dispensed_today.get
         available = []
 
-        for supplement_id, config in self.supplements.items():
-            # Check time window
-            if time_of_day not in config.time_windows:
-                continue
-
+        for config in candidates:
             # Check contraindications (allergies)
-            if any(allergy in config.contraindications for allergy in user_allergies):
+            if allergies & config.contraindications:
                 continue
 
             # Check daily limit
-            already_dispensed = dispensed_today.get(supplement_id, 0)
-            if already_dispensed >= config.max_daily_dose:
+            if get_dispensed(config.id, 0) >= config.max_daily_dose:
                 continue
 
             available.append(config)
@@ -111,12 +280,9 @@ class RulesEngine:
     def get_remaining_dose(
         self,
         supplement_id: str,
-        dispensed_today: Dict[str, float] = None
+        dispensed_today: Mapping[str, float] = _NOTHING_DISPENSED
     ) -> float:
         """Calculate remaining allowable dose for a supplement."""
-        if dispensed_today is None:
-            dispensed_today = {}
-
         config = self.supplements.get(supplement_id)
         if config is None:
             return 0
@@ -129,15 +295,10 @@ class RulesEngine:
         supplement_id: str,
         dose: float,
         time_of_day: str,
-        user_allergies: List[str] = None,
-        dispensed_today: Dict[str, float] = None
+        user_allergies: Collection[str] = _NO_ALLERGIES,
+        dispensed_today: Mapping[str, float] = _NOTHING_DISPENSED
     ) -> Tuple[bool, str]:
         """Validate a supplement recommendation against safety rules."""
-        if user_allergies is None:
-            user_allergies = []
-        if dispensed_today is None:
-            dispensed_today = {}
-
         config = self.supplements.get(supplement_id)
         if config is None:
             return False, f"Unknown supplement: {supplement_id}"
@@ -147,9 +308,11 @@ class RulesEngine:
             return False, f"{config.name} cannot be dispensed in the {time_of_day}"
 
         # Check contraindications
-        for allergy in user_allergies:
-            if allergy in config.contraindications:
-                return False, f"{config.name} is contraindicated for users with {allergy}"
+        conflicts = config.contraindications.intersection(user_allergies)
+        if conflicts:
+            # Callers may pass a set, so pick deterministically rather than by hash order
+            allergy = min(conflicts)
+            return False, f"{config.name} is contraindicated for users with {allergy}"
 
         # Check daily limit
         already_dispensed = dispensed_today.get(supplement_id, 0)
@@ -159,29 +322,43 @@ class RulesEngine:
 
         return True, "OK"
 
-    # Threshold definitions for explainability
+    # Threshold definitions for explainability:
+    # trigger -> (metric id, threshold, comparison, description)
     TRIGGER_THRESHOLDS = {
-        "poor_sleep": {"metric": "sleep_score", "threshold": 60, "comparison": "<", "description": "Sleep score below 60"},
-        "poor_sleep_quality": {"metric": "sleep_score", "threshold": 65, "comparison": "<", "description": "Sleep quality below 65"},
-        "poor_sleep_onset": {"metric": "sleep_score", "threshold": 55, "comparison": "<", "description": "Sleep score below 55"},
-        "low_sleep_score": {"metric": "sleep_score", "threshold": 60, "comparison": "<", "description": "Sleep score below 60"},
-        "sleep_optimization": {"metric": "sleep_score", "threshold": 80, "comparison": "<", "description": "Sleep score below optimal (80)"},
-        "fatigue": {"metric": "sleep_duration_hrs", "threshold": 6, "comparison": "<", "description": "Less than 6 hours of sleep"},
-        "low_hrv": {"metric": "hrv_score", "threshold": 50, "comparison": "<", "description": "HRV score below 50"},
-        "high_stress": {"metric": "hrv_score", "threshold": 45, "comparison": "<", "description": "HRV score below 45 (high stress)"},
-        "poor_recovery": {"metric": "recovery_score", "threshold": 55, "comparison": "<", "description": "Recovery score below 55"},
-        "recovery_needed": {"metric": "recovery_score", "threshold": 60, "comparison": "<", "description": "Recovery score below 60"},
-        "muscle_recovery": {"metric": "recovery_score", "threshold": 70, "comparison": "<", "description": "Recovery score below 70"},
-        "high_strain": {"metric": "strain_score", "threshold": 70, "comparison": ">", "description": "Strain score above 70"},
-        "dehydration": {"metric": "strain_score", "threshold": 75, "comparison": ">", "description": "Strain score above 75"},
-        "high_inflammation": {"metric": "strain_score", "threshold": 60, "comparison": ">", "description": "Strain score above 60"},
-        "low_energy": {"metric": "composite", "threshold": 60, "comparison": "<", "description": "Combined sleep+recovery below 60"},
-        "low_sunlight": {"metric": "default", "threshold": None, "comparison": None, "description": "Default: assume limited sun exposure"},
-        "immune_support": {"metric": "user_reported", "threshold": None, "comparison": None, "description": "User-reported need"},
-        "illness": {"metric": "user_reported", "threshold": None, "comparison": None, "description": "User-reported illness"},
+        "poor_sleep": (METRIC_SLEEP, 60, "<", "Sleep score below 60"),
+        "poor_sleep_quality": (METRIC_SLEEP, 65, "<", "Sleep quality below 65"),
+        "poor_sleep_onset": (METRIC_SLEEP, 55, "<", "Sleep score below 55"),
+        "low_sleep_score": (METRIC_SLEEP, 60, "<", "Sleep score below 60"),
+        "sleep_optimization": (METRIC_SLEEP, 80, "<", "Sleep score below optimal (80)"),
+        "fatigue": (METRIC_SLEEP_DURATION, 6, "<", "Less than 6 hours of sleep"),
+        "low_hrv": (METRIC_HRV, 50, "<", "HRV score below 50"),
+        "high_stress": (METRIC_HRV, 45, "<", "HRV score below 45 (high stress)"),
+        "poor_recovery": (METRIC_RECOVERY, 55, "<", "Recovery score below 55"),
+        "recovery_needed": (METRIC_RECOVERY, 60, "<", "Recovery score below 60"),
+        "muscle_recovery": (METRIC_RECOVERY, 70, "<", "Recovery score below 70"),
+        "high_strain": (METRIC_STRAIN, 70, ">", "Strain score above 70"),
+        "dehydration": (METRIC_STRAIN, 75, ">", "Strain score above 75"),
+        "high_inflammation": (METRIC_STRAIN, 60, ">", "Strain score above 60"),
+        "low_energy": (METRIC_COMPOSITE, 60, "<", "Combined sleep+recovery below 60"),
+        "low_sunlight": (METRIC_DEFAULT, None, None, "Default: assume limited sun exposure"),
+        "immune_support": (METRIC_USER_REPORTED, None, None, "User-reported need"),
+        "illness": (METRIC_USER_REPORTED, None, None, "User-reported illness"),
         # Temperature-based immune triggers
-        "immune_alert": {"metric": "temperature_deviation", "threshold": 0.5, "comparison": ">", "description": "Body temperature 0.5°C+ above baseline"},
-        "immune_crisis": {"metric": "temperature_deviation", "threshold": 1.0, "comparison": ">", "description": "Significant temperature elevation (1°C+ above baseline)"},
+        "immune_alert": (METRIC_TEMPERATURE, 0.5, ">", "Body temperature 0.5°C+ above baseline"),
+        "immune_crisis": (METRIC_TEMPERATURE, 1.0, ">", "Significant temperature elevation (1°C+ above baseline)"),
+    }
+
+    # Static part of each trigger explanation: trigger -> (metric id, explanation dict)
+    _EXPLANATION_TEMPLATES = {
+        trigger_name: (metric_id, {
+            "trigger": trigger_name,
+            "description": description,
+            "metric": METRIC_NAMES[metric_id],
+            "actual_value": None,
+            "threshold": threshold,
+            "comparison": comparison
+        })
+        for trigger_name, (metric_id, threshold, comparison, description) in TRIGGER_THRESHOLDS.items()
     }
 
     def analyze_health_triggers(
@@ -214,39 +391,20 @@ class RulesEngine:
         if baseline:
             triggers.update(self._analyze_with_baseline(health_data, baseline))
         else:
-            # Fallback to fixed thresholds
-            # Sleep-related triggers
-            if sleep_score is not None:
-                triggers["poor_sleep"] = sleep_score < 60
-                triggers["poor_sleep_quality"] = sleep_score < 65
-                triggers["poor_sleep_onset"] = sleep_score < 55
-                triggers["low_sleep_score"] = sleep_score < 60
-                triggers["sleep_optimization"] = sleep_score < 80
-
-            if sleep_duration is not None:
-                triggers["fatigue"] = sleep_duration < 6
-
-            # Stress/HRV triggers
-            if hrv_score is not None:
-                triggers["low_hrv"] = hrv_score < 50
-                triggers["high_stress"] = hrv_score < 45
-
-            # Recovery triggers
-            if recovery_score is not None:
-                triggers["poor_recovery"] = recovery_score < 55
-                triggers["recovery_needed"] = recovery_score < 60
-                triggers["muscle_recovery"] = recovery_score < 70
-
-            # Strain triggers
-            if strain_score is not None:
-                triggers["high_strain"] = strain_score > 70
-                triggers["dehydration"] = strain_score > 75
-
-            # Energy triggers (composite)
-            if sleep_score is not None and recovery_score is not None:
-                triggers["low_energy"] = (sleep_score + recovery_score) / 2 < 60
-
-            triggers["high_inflammation"] = strain_score > 60 if strain_score else False
+            # Fallback to fixed thresholds, indexed by metric id
+            composite = (
+                sleep_score + recovery_score
+                if sleep_score is not None and recovery_score is not None
+                else None
+            )
+            values = (sleep_score, hrv_score, recovery_score, strain_score, sleep_duration, None, composite)
+            for name, metric_id, compare, threshold in FIXED_THRESHOLD_RULES:
+                value = values[metric_id]
+                if value is not None:
+                    triggers[name] = compare(value, threshold)
+
+            # Inflammation is always reported, even without strain data
+            triggers.setdefault("high_inflammation", False)
 
         # Check-in based triggers (subjective reports override objective data)
         if checkin:
@@ -298,24 +456,6 @@ class RulesEngine:
         """
         triggers = {}
 
-        def is_significantly_low(current, mean, std, metric_name):
-            """Check if current value is significantly below personal baseline."""
-            if current is None or mean is None:
-                return False
-            if std is None or std == 0:
-                # No variance data, use 15% threshold
-                return current < (mean * 0.85)
-            # More than 1 std deviation below mean
-            return current < (mean - std)
-
-        def is_significantly_high(current, mean, std):
-            """Check if current value is significantly above personal baseline."""
-            if current is None or mean is None:
-                return False
-            if std is None or std == 0:
-                return current > (mean * 1.15)
-            return current > (mean + std)
-
         sleep_score = health_data.get("sleep_score")
         hrv_score = health_data.get("hrv_score")
         recovery_score = health_data.get("recovery_score")
@@ -324,139 +464,108 @@ class RulesEngine:
 
         # Get baseline values
         sleep_baseline = baseline.get("sleep_score", {})
-        hrv_baseline = baseline.get("hrv", {})
         recovery_baseline = baseline.get("recovery_score", {})
-        strain_baseline = baseline.get("strain_score", {})
-        sleep_dur_baseline = baseline.get("sleep_duration", {})
+        sleep_mean, sleep_std = _mean_and_std(sleep_baseline)
 
         # Sleep triggers - below personal baseline
         if sleep_score is not None:
-            is_low = is_significantly_low(
-                sleep_score,
-                sleep_baseline.get("mean"),
-                sleep_baseline.get("std"),
-                "sleep"
-            )
+            is_low = _is_significantly_low(sleep_score, sleep_mean, sleep_std)
             triggers["poor_sleep"] = is_low
             triggers["poor_sleep_quality"] = is_low
             triggers["low_sleep_score"] = is_low
-            triggers["sleep_optimization"] = sleep_score < (sleep_baseline.get("mean", 80) * 0.95) if sleep_baseline.get("mean") else sleep_score < 80
+            triggers["sleep_optimization"] = sleep_score < (sleep_mean * 0.95) if sleep_mean else sleep_score < 80
 
         # HRV triggers - below personal baseline indicates stress
         if hrv_score is not None:
-            is_low = is_significantly_low(
-                hrv_score,
-                hrv_baseline.get("mean"),
-                hrv_baseline.get("std"),
-                "hrv"
-            )
+            is_low = _is_significantly_low(hrv_score, *_mean_and_std(baseline.get("hrv", {})))
             triggers["low_hrv"] = is_low
             triggers["high_stress"] = is_low
 
         # Recovery triggers
         if recovery_score is not None:
-            is_low = is_significantly_low(
-                recovery_score,
-                recovery_baseline.get("mean"),
-                recovery_baseline.get("std"),
-                "recovery"
-            )
+            is_low = _is_significantly_low(recovery_score, *_mean_and_std(recovery_baseline))
             triggers["poor_recovery"] = is_low
             triggers["recovery_needed"] = is_low
             triggers["muscle_recovery"] = is_low
 
         # Strain triggers - above personal baseline
         if strain_score is not None:
-            is_high = is_significantly_high(
-                strain_score,
-                strain_baseline.get("mean"),
-                strain_baseline.get("std")
-            )
+            is_high = _is_significantly_high(strain_score, *_mean_and_std(baseline.get("strain_score", {})))
             triggers["high_strain"] = is_high
             triggers["dehydration"] = is_high
             triggers["high_inflammation"] = is_high
 
         # Sleep duration
         if sleep_duration is not None:
-            is_low = is_significantly_low(
-                sleep_duration,
-                sleep_dur_baseline.get("mean"),
-                sleep_dur_baseline.get("std"),
-                "sleep_duration"
-            )
+            is_low = _is_significantly_low(sleep_duration, *_mean_and_std(baseline.get("sleep_duration", {})))
             triggers["fatigue"] = is_low
 
         # Energy composite
         if sleep_score is not None and recovery_score is not None:
-            sleep_mean = sleep_baseline.get("mean", 70)
-            recovery_mean = recovery_baseline.get("mean", 70)
-            personal_energy_baseline = (sleep_mean + recovery_mean) / 2
-            current_energy = (sleep_score + recovery_score) / 2
-            triggers["low_energy"] = current_energy < (personal_energy_baseline * 0.85)
+            # Both sides are averages of two scores, so compare the sums directly
+            personal_energy_total = sleep_baseline.get("mean", 70) + recovery_baseline.get("mean", 70)
+            current_energy_total = sleep_score + recovery_score
+            triggers["low_energy"] = current_energy_total < (personal_energy_total * 0.85)
 
         return triggers
 
     def get_trigger_explanation(self, trigger_name: str, health_data: dict) -> Optional[dict]:
         """Get detailed explanation for why a trigger is active."""
-        threshold_info = self.TRIGGER_THRESHOLDS.get(trigger_name)
-        if not threshold_info:
+        entry = self._EXPLANATION_TEMPLATES.get(trigger_name)
+        if entry is None:
             return None
 
-        metric = threshold_info["metric"]
-        threshold = threshold_info["threshold"]
-        comparison = threshold_info["comparison"]
-        description = threshold_info["description"]
+        metric_id, template = entry
+
+        # Default and user-reported triggers have no measured value
+        if metric_id >= METRIC_DEFAULT:
+            return dict(template)
 
         # Handle composite metric
-        if metric == "composite":
+        if metric_id == METRIC_COMPOSITE:
             sleep_score = health_data.get("sleep_score")
             recovery_score = health_data.get("recovery_score")
-            if sleep_score is not None and recovery_score is not None:
-                actual_value = (sleep_score + recovery_score) / 2
-            else:
+            if sleep_score is None or recovery_score is None:
                 return None
-        elif metric in ("default", "user_reported"):
-            return {
-                "trigger": trigger_name,
-                "description": description,
-                "metric": metric,
-                "actual_value": None,
-                "threshold": None,
-                "comparison": None
-            }
+            actual_value = (sleep_score + recovery_score) / 2
         else:
-            actual_value = health_data.get(metric)
+            actual_value = health_data.get(METRIC_NAMES[metric_id])
             if actual_value is None:
                 return None
 
-        return {
-            "trigger": trigger_name,
-            "description": description,
-            "metric": metric,
-            "actual_value": round(actual_value, 1) if actual_value else None,
-            "threshold": threshold,
-            "comparison": comparison
-        }
+        explanation = dict(template)
+        if actual_value:
+            explanation["actual_value"] = round(actual_value, 1)
+        return explanation
+
+    def get_triggers_by_supplement(self, active_triggers: ActiveTriggers) -> Dict[str, List[str]]:
+        """Map each supplement id to the active triggers it responds to."""
+        return self._collect_matches(active_triggers)
 
     def match_supplements_to_triggers(
         self,
-        active_triggers: Dict[str, bool],
+        active_triggers: ActiveTriggers,
         available_supplements: List[SupplementConfig]
     ) -> List[Tuple[SupplementConfig, List[str]]]:
-        """Match supplements to active health triggers."""
-        matches = []
+        """
+        Match supplements to active health triggers.
 
-        for supplement in available_supplements:
-            matched_triggers = []
-            for trigger_name, is_active in active_triggers.items():
-                if is_active and supplement.triggers.get(trigger_name, False):
-                    matched_triggers.append(trigger_name)
+        Args:
+            active_triggers: Trigger name -> whether it is active, or just the
+                names of the active triggers
+            available_supplements: Supplements that passed the safety rules
+        """
+        # Walk only the supplements each active trigger points at
+        matched = self._collect_matches(active_triggers)
 
-            if matched_triggers:
-                matches.append((supplement, matched_triggers))
+        matches = [
+            (supplement, matched[supplement.id])
+            for supplement in available_supplements
+            if supplement.id in matched
+        ]
 
         # Sort by number of matched triggers (more matches = higher priority)
-        matches.sort(key=lambda x: len(x[1]), reverse=True)
+        matches.sort(key=_matched_trigger_count, reverse=True)
 
         return matches
 
@@ -519,3 +628,29 @@ class RulesEngine:
             user_medications,
             usage_history
         )
+
+
+@lru_cache(maxsize=8)
+def _load_supplement_tables(path: str) -> Tuple[
+    Mapping[str, SupplementConfig],
+    Dict[str, Tuple[SupplementConfig, ...]],
+    Dict[str, Tuple[str, ...]],
+]:
+    """
+    Parse a supplements file and build its lookup tables, once per resolved path.
+
+    The supplement map is read-only because it is shared by every engine
+    built from the same file.
+    """
+    supplements = RulesEngine._load_supplements(path)
+    return (
+        MappingProxyType(supplements),
+        RulesEngine._bucket_by_time_of_day(supplements),
+        RulesEngine._index_by_trigger(supplements),
+    )
+
+
+@lru_cache
+def get_rules_engine(supplements_path: Optional[str] = None) -> RulesEngine:
+    """Return the shared, read-only RulesEngine for a supplements file."""
+    return RulesEngine(supplements_path)
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
+import httpx
 
-@dataclass
+
+@dataclass(slots=True)
 class NormalizedHealthData:
     """Standardized health data format from any wearable source."""
     sleep_score: Optional[float] = None  # 0-100
@@ -17,29 +19,55 @@ class NormalizedHealthData:
     rem_sleep_pct: Optional[float] = None
     source: str = "unknown"
     timestamp: datetime = None
+    # (timestamp, ISO string) from the last to_dict, reused while timestamp is unchanged
+    _timestamp_iso: Optional[Tuple[datetime, str]] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.utcnow()
 
     def to_dict(self) -> dict:
-        return {
-            "sleep_score": self.sleep_score,
-            "hrv_score": self.hrv_score,
-            "recovery_score": self.recovery_score,
-            "strain_score": self.strain_score,
-            "resting_hr": self.resting_hr,
-            "sleep_duration_hrs": self.sleep_duration_hrs,
-            "deep_sleep_pct": self.deep_sleep_pct,
-            "rem_sleep_pct": self.rem_sleep_pct,
-            "source": self.source,
-            "timestamp": self.timestamp.isoformat()
-        }
+        data = {name: getattr(self, name) for name in _HEALTH_DATA_VALUE_FIELDS}
+        cached = self._timestamp_iso
+        if cached is None or cached[0] is not self.timestamp:
+            cached = self._timestamp_iso = (self.timestamp, self.timestamp.isoformat())
+        data["timestamp"] = cached[1]
+        return data
+
+
+# Fields serialized as-is by NormalizedHealthData.to_dict (timestamp is ISO-formatted)
+_HEALTH_DATA_VALUE_FIELDS = tuple(
+    f.name for f in fields(NormalizedHealthData) if f.init and f.name != "timestamp"
+)
 
 
 class WearableIntegration(ABC):
     """Abstract base class for wearable integrations."""
 
+    # One HTTP client shared by every integration, so keep-alive connections
+    # to the wearable APIs are reused across requests
+    _client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    async def _get_client() -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        client = WearableIntegration._client
+        if client is None or client.is_closed:
+            client = WearableIntegration._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=httpx.Timeout(10.0),
+                http2=True,
+            )
+        return client
+
+    @staticmethod
+    async def aclose() -> None:
+        """Close the shared HTTP client (called on application shutdown)."""
+        client = WearableIntegration._client
+        if client is not None:
+            WearableIntegration._client = None
+            await client.aclose()
+
     @abstractmethod
     async def fetch_latest_data(self, access_token: dict) -> NormalizedHealthData:
         """Fetch and normalize the latest health data from the wearable."""
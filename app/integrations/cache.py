@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Wearable data only changes a few times a day, so repeated dashboard loads
+# and syncs are served from memory for a short while.
+DEFAULT_TTL = 600  # seconds
+_MAX_ENTRIES = 2048
+
+# key -> (expires_at monotonic time, value), oldest write first
+_entries: Dict[Hashable, Tuple[float, Any]] = {}
+# key -> load currently in progress, shared by concurrent callers
+_inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+
+def token_key(access_token: Optional[str]) -> str:
+    """Hash an access token so raw tokens are never kept as cache keys."""
+    return hashlib.blake2b((access_token or "").encode(), digest_size=8).hexdigest()
+
+
+def cache_get(key: Hashable) -> Optional[Any]:
+    """Get a cached value, or None if missing or expired."""
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        _entries.pop(key, None)
+        return None
+    return entry[1]
+
+
+def cache_set(key: Hashable, value: Any, ttl: float = DEFAULT_TTL) -> None:
+    """Cache a value for ttl seconds."""
+    now = time.monotonic()
+    # Re-insert so the dict stays ordered by write time
+    _entries.pop(key, None)
+    if len(_entries) >= _MAX_ENTRIES:
+        for stale in [k for k, (expires_at, _) in _entries.items() if expires_at < now]:
+            del _entries[stale]
+        # Still full of live entries: evict only the oldest, not everything
+        while len(_entries) >= _MAX_ENTRIES:
+            del _entries[next(iter(_entries))]
+    _entries[key] = (now + ttl, value)
+
+
+async def get_or_fetch(
+    key: Hashable,
+    ttl: float,
+    loader: Callable[[], Awaitable[Any]],
+    cache_if: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """Get a cached value, or load it once for all concurrent callers.
+
+    Args:
+        key: Cache key
+        ttl: Seconds to keep the loaded value
+        loader: Coroutine function producing the value on a miss
+        cache_if: Optional predicate; results it rejects are returned but not cached
+    """
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_load(key, ttl, loader, cache_if))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the load for the others
+    return await asyncio.shield(task)
+
+
+async def _load(key, ttl, loader, cache_if) -> Any:
+    value = await loader()
+    if value is not None and (cache_if is None or cache_if(value)):
+        cache_set(key, value, ttl)
+    return value
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Hashable, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent requests to one upstream API.
+
+    The limit grows by roughly one slot per window of successful responses and
+    is halved whenever the upstream signals overload (429 or 5xx), so bursts
+    across many users settle at what the API will actually accept.
+    """
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 32):
+        self.minimum = minimum
+        self.maximum = maximum
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self._limit))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot for the duration of a request."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        condition = self._condition
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    def record_success(self) -> None:
+        """Additive increase: +1 slot once a full window of requests succeeds."""
+        self._limit = min(self.maximum, self._limit + 1 / self._limit)
+
+    def record_overload(self) -> None:
+        """Multiplicative decrease on 429/5xx."""
+        self._limit = max(self.minimum, self._limit / 2)
+
+
+class SlidingWindowThrottle:
+    """Admit at most `limit` requests per key in any `window` seconds, waiting otherwise.
+
+    Keeps requests under a known quota up front instead of discovering it via 429s.
+    """
+
+    _MAX_KEYS = 1024
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._hits: Dict[Hashable, Deque[float]] = {}
+
+    async def acquire(self, key: Hashable) -> None:
+        while True:
+            now = time.monotonic()
+            hits = self._hits.get(key)
+            if hits is None:
+                if len(self._hits) >= self._MAX_KEYS:
+                    self._prune(now)
+                hits = self._hits[key] = deque()
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if len(hits) < self.limit:
+                hits.append(now)
+                return
+            await asyncio.sleep(hits[0] + self.window - now)
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]:
+            del self._hits[key]
+
+
+def retry_after_seconds(value: Optional[str], maximum: float) -> Optional[float]:
+    """Parse a Retry-After header given in seconds, capped at maximum."""
+    if not value:
+        return None
+    try:
+        return min(maximum, max(0.0, float(value)))
+    except ValueError:
+        # HTTP-date form isn't used by the wearable APIs
+        return None
@@ -4,6 +4,75 @@ from datetime import datetime
 from .base import WearableIntegration, NormalizedHealthData
 
 
+# Fixed readings for the deterministic scenarios, built once at import
+_SCENARIOS = {
+    "average": {
+        "sleep_score": 75,
+        "hrv_score": 70,
+        "recovery_score": 72,
+        "strain_score": 50,
+        "resting_hr": 58,
+        "sleep_duration_hrs": 7.5,
+        "deep_sleep_pct": 20,
+        "rem_sleep_pct": 22,
+    },
+    "poor_sleep": {
+        "sleep_score": 45,
+        "hrv_score": 55,
+        "recovery_score": 50,
+        "strain_score": 40,
+        "resting_hr": 65,
+        "sleep_duration_hrs": 5.5,
+        "deep_sleep_pct": 12,
+        "rem_sleep_pct": 15,
+    },
+    "high_strain": {
+        "sleep_score": 70,
+        "hrv_score": 60,
+        "recovery_score": 55,
+        "strain_score": 85,
+        "resting_hr": 62,
+        "sleep_duration_hrs": 7.0,
+        "deep_sleep_pct": 18,
+        "rem_sleep_pct": 20,
+    },
+    "stressed": {
+        "sleep_score": 60,
+        "hrv_score": 40,
+        "recovery_score": 45,
+        "strain_score": 60,
+        "resting_hr": 70,
+        "sleep_duration_hrs": 6.5,
+        "deep_sleep_pct": 15,
+        "rem_sleep_pct": 18,
+    },
+    "recovering": {
+        "sleep_score": 85,
+        "hrv_score": 80,
+        "recovery_score": 88,
+        "strain_score": 30,
+        "resting_hr": 52,
+        "sleep_duration_hrs": 8.5,
+        "deep_sleep_pct": 25,
+        "rem_sleep_pct": 25,
+    },
+}
+
+
+def _random_scenario() -> dict:
+    """Randomized readings for the "random" scenario."""
+    return {
+        "sleep_score": random.randint(30, 95),
+        "hrv_score": random.randint(30, 95),
+        "recovery_score": random.randint(30, 95),
+        "strain_score": random.randint(20, 90),
+        "resting_hr": random.randint(45, 75),
+        "sleep_duration_hrs": round(random.uniform(4.5, 9.5), 1),
+        "deep_sleep_pct": random.randint(10, 30),
+        "rem_sleep_pct": random.randint(15, 28),
+    }
+
+
 class MockIntegration(WearableIntegration):
     """Mock wearable integration for testing and development."""
 
@@ -23,70 +92,10 @@ class MockIntegration(WearableIntegration):
 
     async def fetch_latest_data(self, access_token: dict = None) -> NormalizedHealthData:
         """Generate mock health data based on scenario."""
-        scenarios = {
-            "average": {
-                "sleep_score": 75,
-                "hrv_score": 70,
-                "recovery_score": 72,
-                "strain_score": 50,
-                "resting_hr": 58,
-                "sleep_duration_hrs": 7.5,
-                "deep_sleep_pct": 20,
-                "rem_sleep_pct": 22,
-            },
-            "poor_sleep": {
-                "sleep_score": 45,
-                "hrv_score": 55,
-                "recovery_score": 50,
-                "strain_score": 40,
-                "resting_hr": 65,
-                "sleep_duration_hrs": 5.5,
-                "deep_sleep_pct": 12,
-                "rem_sleep_pct": 15,
-            },
-            "high_strain": {
-                "sleep_score": 70,
-                "hrv_score": 60,
-                "recovery_score": 55,
-                "strain_score": 85,
-                "resting_hr": 62,
-                "sleep_duration_hrs": 7.0,
-                "deep_sleep_pct": 18,
-                "rem_sleep_pct": 20,
-            },
-            "stressed": {
-                "sleep_score": 60,
-                "hrv_score": 40,
-                "recovery_score": 45,
-                "strain_score": 60,
-                "resting_hr": 70,
-                "sleep_duration_hrs": 6.5,
-                "deep_sleep_pct": 15,
-                "rem_sleep_pct": 18,
-            },
-            "recovering": {
-                "sleep_score": 85,
-                "hrv_score": 80,
-                "recovery_score": 88,
-                "strain_score": 30,
-                "resting_hr": 52,
-                "sleep_duration_hrs": 8.5,
-                "deep_sleep_pct": 25,
-                "rem_sleep_pct": 25,
-            },
-            "random": {
-                "sleep_score": random.randint(30, 95),
-                "hrv_score": random.randint(30, 95),
-                "recovery_score": random.randint(30, 95),
-                "strain_score": random.randint(20, 90),
-                "resting_hr": random.randint(45, 75),
-                "sleep_duration_hrs": round(random.uniform(4.5, 9.5), 1),
-                "deep_sleep_pct": random.randint(10, 30),
-                "rem_sleep_pct": random.randint(15, 28),
-            },
-        }
-
-        data = scenarios.get(self.scenario, scenarios["average"])
+        if self.scenario == "random":
+            data = _random_scenario()
+        else:
+            data = _SCENARIOS.get(self.scenario, _SCENARIOS["average"])
 
         return NormalizedHealthData(
             **data,
@@ -1,10 +1,98 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Any
+import asyncio
+import dataclasses
 import httpx
-from datetime import datetime, timedelta
+import orjson
+import random
+from datetime import date, datetime, timedelta
 import time
+from urllib.parse import urlencode
 
 from app.config import get_settings
 from .base import WearableIntegration, NormalizedHealthData
+from .cache import DEFAULT_TTL, cache_get, cache_set, get_or_fetch, token_key
+from .limits import AdaptiveConcurrencyLimiter, SlidingWindowThrottle, retry_after_seconds
+
+# Shared default for days an endpoint has no record for; never mutated
+_EMPTY: dict = {}
+_ONE_DAY = timedelta(days=1)
+
+# Transient failures (network errors, rate limiting, 5xx) are retried with
+# jittered exponential backoff before an endpoint is given up on
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.2  # seconds
+_RETRY_MAX_DELAY = 2.0
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_RETRY_AFTER_MAX = 10.0  # longest Retry-After we'll wait inside a request
+
+# Concurrent Oura requests across all users; backs off when Oura reports overload
+_limiter = AdaptiveConcurrencyLimiter()
+# Oura's quota is 5000 requests per 5 minutes per access token; stay under it
+# rather than waiting for 429s. A full 365-day sync (~104 requests) never waits.
+_throttle = SlidingWindowThrottle(limit=5000, window=300)
+
+# Long historical pulls are split into windows of this many days and fetched
+# concurrently (bounded by _limiter); Oura is slow on very large ranges
+HISTORY_WINDOW_DAYS = 30
+# Longest range one historical pull covers (at most 13 windows per endpoint);
+# older start dates are clamped so a single call can't fan out unboundedly
+MAX_HISTORY_DAYS = 365
+
+# How long ETag-validated records, and successful connection checks, are kept
+ETAG_CACHE_TTL = 24 * 60 * 60
+VERIFY_CACHE_TTL = 60
+
+# Refreshed token data keyed by token_key() of the refresh token it replaced, so
+# requests still holding the stale token reuse it, plus refreshes in flight
+_refreshed_tokens: Dict[str, dict] = {}
+_inflight_refreshes: Dict[str, "asyncio.Future[dict]"] = {}
+
+
+def _session_rank(session: dict) -> Tuple[bool, int]:
+    """Sort key for picking a day's main sleep: "long_sleep" over naps, then longest."""
+    return (session.get("type") == "long_sleep", session.get("total_sleep_duration") or 0)
+
+
+def _is_preferred_session(session: dict, current: Optional[dict]) -> bool:
+    """Whether a sleep session should replace the current pick for its day."""
+    return not current or _session_rank(session) > _session_rank(current)
+
+
+def _spo2_average(spo2: dict) -> Optional[float]:
+    """Average SpO2, from the nested spo2_percentage object or the older flat field."""
+    percentage = spo2.get("spo2_percentage")
+    if isinstance(percentage, dict):
+        return percentage.get("average")
+    return spo2.get("spo2_average")
+
+
+def _date_windows(start: date, end: date) -> List[dict]:
+    """Split a date range into request params of at most HISTORY_WINDOW_DAYS each.
+
+    Consecutive windows share their boundary day, since end_date handling differs
+    between Oura endpoints; duplicate records collapse when indexed by day.
+    Ranges longer than MAX_HISTORY_DAYS are clamped to the most recent part.
+    """
+    windows = []
+    current = max(start, end - timedelta(days=MAX_HISTORY_DAYS))
+    while True:
+        stop = min(end, current + timedelta(days=HISTORY_WINDOW_DAYS))
+        windows.append({"start_date": current.isoformat(), "end_date": stop.isoformat()})
+        if stop >= end:
+            return windows
+        current = stop
+
+
+def _records_or_raise(results: List[Any]) -> List[List[dict]]:
+    """Treat endpoints that failed as empty, unless every endpoint failed."""
+    if all(isinstance(r, BaseException) for r in results):
+        raise results[0]
+    return [[] if isinstance(r, BaseException) else r for r in results]
+
+
+def _is_complete(result: Tuple[Any, bool]) -> bool:
+    """Only cache fetch results for which every endpoint answered."""
+    return result[1]
 
 
 class OuraIntegration(WearableIntegration):
@@ -13,114 +101,143 @@ class OuraIntegration(WearableIntegration):
     BASE_URL = "https://api.ouraring.com/v2"
     AUTH_URL = "https://cloud.ouraring.com/oauth/authorize"
     TOKEN_URL = "https://api.ouraring.com/oauth/token"
+    # Scopes must match what's registered in Oura developer portal
+    SCOPES = "email personal daily heartrate tag workout session spo2 ring_configuration stress heart_health"
+    # Treat tokens as expired when less than this many seconds remain
+    TOKEN_EXPIRY_SKEW = 300
+    # Endpoints not every account has access to; failures yield no records
+    OPTIONAL_ENDPOINTS = ("daily_spo2", "daily_stress", "workout", "vO2_max")
 
     def __init__(self):
         self.settings = get_settings()
 
     def get_auth_url(self, redirect_uri: str, state: str = None) -> str:
         """Get Oura OAuth authorization URL."""
-        # Scopes must match what's registered in Oura developer portal
-        scopes = "email+personal+daily+heartrate+tag+workout+session+spo2+ring_configuration+stress+heart_health"
-        url = (
-            f"{self.AUTH_URL}"
-            f"?client_id={self.settings.oura_client_id}"
-            f"&redirect_uri={redirect_uri}"
-            f"&response_type=code"
-            f"&scope={scopes}"
-        )
+        params = {
+            "client_id": self.settings.oura_client_id,
+            "redirect_uri": redirect_uri,
+            "response_type": "code",
+            "scope": self.SCOPES,
+        }
         if state:
-            url += f"&state={state}"
-        return url
+            params["state"] = state
+        return f"{self.AUTH_URL}?{urlencode(params)}"
 
     async def exchange_code(self, code: str, redirect_uri: str) -> dict:
         """Exchange authorization code for access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "redirect_uri": redirect_uri,
-                    "client_id": self.settings.oura_client_id,
-                    "client_secret": self.settings.oura_client_secret,
-                }
-            )
-            response.raise_for_status()
-            token_data = response.json()
+        client = await self._get_client()
+        response = await client.post(
+            self.TOKEN_URL,
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": redirect_uri,
+                "client_id": self.settings.oura_client_id,
+                "client_secret": self.settings.oura_client_secret,
+            }
+        )
+        response.raise_for_status()
+        token_data = orjson.loads(response.content)
 
-            # Add expiry timestamp for easier checking
-            if "expires_in" in token_data:
-                token_data["expires_at"] = int(time.time()) + token_data["expires_in"]
+        # Add expiry timestamp for easier checking
+        if "expires_in" in token_data:
+            token_data["expires_at"] = int(time.time()) + token_data["expires_in"]
 
-            return token_data
+        return token_data
 
     async def refresh_token(self, refresh_token: str) -> dict:
-        """Refresh an expired access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token,
-                    "client_id": self.settings.oura_client_id,
-                    "client_secret": self.settings.oura_client_secret,
-                }
-            )
-            response.raise_for_status()
-            token_data = response.json()
+        """Refresh an expired access token.
+
+        Concurrent calls with the same refresh token share a single request to
+        the token endpoint (Oura refresh tokens are single use).
+        """
+        key = token_key(refresh_token)
+        task = _inflight_refreshes.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._do_refresh(refresh_token))
+            _inflight_refreshes[key] = task
+            task.add_done_callback(lambda _: _inflight_refreshes.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the refresh for the others
+        return await asyncio.shield(task)
+
+    async def _do_refresh(self, refresh_token: str) -> dict:
+        client = await self._get_client()
+        response = await client.post(
+            self.TOKEN_URL,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": self.settings.oura_client_id,
+                "client_secret": self.settings.oura_client_secret,
+            }
+        )
+        response.raise_for_status()
+        token_data = orjson.loads(response.content)
 
-            if "expires_in" in token_data:
-                token_data["expires_at"] = int(time.time()) + token_data["expires_in"]
+        if "expires_in" in token_data:
+            token_data["expires_at"] = int(time.time()) + token_data["expires_in"]
 
-            return token_data
+        for stale in [k for k, v in _refreshed_tokens.items() if self.is_token_expired(v)]:
+            del _refreshed_tokens[stale]
+        _refreshed_tokens[token_key(refresh_token)] = token_data
+        return token_data
 
     def is_token_expired(self, token_data: dict) -> bool:
         """Check if the access token is expired or about to expire."""
-        expires_at = token_data.get("expires_at", 0)
-        # Consider expired if less than 5 minutes remaining
-        return time.time() > (expires_at - 300)
+        return time.time() > token_data.get("expires_at", 0) - self.TOKEN_EXPIRY_SKEW
 
     async def get_valid_token(self, token_data: dict) -> dict:
         """Get a valid token, refreshing if necessary."""
-        if self.is_token_expired(token_data):
-            refresh_token = token_data.get("refresh_token")
-            if refresh_token:
-                return await self.refresh_token(refresh_token)
+        if not self.is_token_expired(token_data):
+            return token_data
+
+        refresh_token = token_data.get("refresh_token")
+        if not refresh_token:
             raise Exception("Token expired and no refresh token available")
-        return token_data
+
+        refreshed = self._get_refreshed_token(refresh_token)
+        if refreshed is not None:
+            return refreshed
+        return await self.refresh_token(refresh_token)
+
+    def _get_refreshed_token(self, refresh_token: str) -> Optional[dict]:
+        """Get still-valid token data already obtained with this refresh token."""
+        refreshed = _refreshed_tokens.get(token_key(refresh_token))
+        if refreshed is None or self.is_token_expired(refreshed):
+            return None
+        return refreshed
 
     async def fetch_latest_data(self, access_token: dict) -> NormalizedHealthData:
         """Fetch and normalize the latest health data from Oura."""
         token = access_token.get("access_token")
         headers = {"Authorization": f"Bearer {token}"}
 
-        today = datetime.utcnow().date()
-        yesterday = today - timedelta(days=1)
-
-        async with httpx.AsyncClient() as client:
-            # Fetch daily sleep summary
-            sleep_response = await client.get(
-                f"{self.BASE_URL}/usercollection/daily_sleep",
-                headers=headers,
-                params={"start_date": str(yesterday), "end_date": str(today)}
-            )
-            sleep_data = sleep_response.json().get("data", [])
-
-            # Fetch detailed sleep data (contains actual HRV)
-            detailed_sleep_response = await client.get(
-                f"{self.BASE_URL}/usercollection/sleep",
-                headers=headers,
-                params={"start_date": str(yesterday), "end_date": str(today)}
-            )
-            detailed_sleep_data = detailed_sleep_response.json().get("data", [])
-
-            # Fetch readiness data
-            readiness_response = await client.get(
-                f"{self.BASE_URL}/usercollection/daily_readiness",
-                headers=headers,
-                params={"start_date": str(yesterday), "end_date": str(today)}
-            )
-            readiness_data = readiness_response.json().get("data", [])
+        now = datetime.utcnow()
+        data, _ = await get_or_fetch(
+            ("oura", "latest", token_key(token), now.date()),
+            DEFAULT_TTL,
+            lambda: self._load_latest(headers, now),
+            cache_if=_is_complete,
+        )
+        return dataclasses.replace(data)
+
+    async def _load_latest(self, headers: dict, now: datetime) -> Tuple[NormalizedHealthData, bool]:
+        """Fetch the latest Oura data; the flag is False if an endpoint failed."""
+        today = now.date()
+        yesterday = today - _ONE_DAY
+        params = {"start_date": str(yesterday), "end_date": str(today)}
+
+        # Daily sleep summary, detailed sleep (contains actual HRV) and
+        # readiness are independent, so request them concurrently
+        client = await self._get_client()
+        results = await asyncio.gather(
+            self._fetch_records(client, "daily_sleep", headers, params),
+            self._fetch_records(client, "sleep", headers, params),
+            self._fetch_records(client, "daily_readiness", headers, params),
+            return_exceptions=True,
+        )
+        complete = not any(isinstance(r, BaseException) for r in results)
+        sleep_data, detailed_sleep_data, readiness_data = _records_or_raise(results)
 
         # Extract latest values
         latest_sleep = sleep_data[-1] if sleep_data else {}
@@ -129,243 +246,309 @@ class OuraIntegration(WearableIntegration):
         # Find the best sleep session - prefer "long_sleep" (main sleep) over naps
         latest_detailed_sleep = {}
         for d in detailed_sleep_data:
-            if not latest_detailed_sleep:
-                latest_detailed_sleep = d
-            elif d.get("type") == "long_sleep" and latest_detailed_sleep.get("type") != "long_sleep":
+            if _is_preferred_session(d, latest_detailed_sleep):
                 latest_detailed_sleep = d
-            elif d.get("type") == latest_detailed_sleep.get("type"):
-                # Same type - prefer longer duration
-                if (d.get("total_sleep_duration") or 0) > (latest_detailed_sleep.get("total_sleep_duration") or 0):
-                    latest_detailed_sleep = d
-
-        # Get actual HRV in milliseconds from detailed sleep data
-        actual_hrv = latest_detailed_sleep.get("average_hrv")
 
         # Normalize to our schema
-        return NormalizedHealthData(
-            sleep_score=latest_sleep.get("score"),
-            hrv_score=actual_hrv,  # Actual HRV in milliseconds
-            recovery_score=latest_readiness.get("score"),
-            strain_score=self._calculate_strain_from_activity(latest_readiness),
-            resting_hr=latest_readiness.get("contributors", {}).get("resting_heart_rate"),
-            sleep_duration_hrs=self._seconds_to_hours(latest_detailed_sleep.get("total_sleep_duration")),
-            deep_sleep_pct=latest_sleep.get("contributors", {}).get("deep_sleep"),
-            rem_sleep_pct=latest_sleep.get("contributors", {}).get("rem_sleep"),
+        data = NormalizedHealthData(
+            **self._extract_core_metrics(latest_sleep, latest_detailed_sleep, latest_readiness),
             source="oura",
-            timestamp=datetime.utcnow()
+            timestamp=now
         )
-
-    async def fetch_historical_data(self, access_token: dict, days: int = 7) -> List[dict]:
-        """Fetch comprehensive historical health data for the past N days."""
+        return data, complete
+
+    async def fetch_historical_data(
+        self,
+        access_token: dict,
+        days: int = 7,
+        include_activity: bool = True,
+    ) -> List[dict]:
+        """Fetch comprehensive historical health data for the past N days.
+
+        Args:
+            access_token: Oura token data
+            days: Number of days to look back from today
+            include_activity: Fetch daily activity (steps, calories, active time);
+                callers that don't use those fields can skip the request
+        """
         token = access_token.get("access_token")
         headers = {"Authorization": f"Bearer {token}"}
 
         today = datetime.utcnow().date()
+        historical, _ = await get_or_fetch(
+            ("oura", "historical", token_key(token), today, days, include_activity),
+            DEFAULT_TTL,
+            lambda: self._load_historical(headers, today, days, include_activity),
+            cache_if=_is_complete,
+        )
+        # Callers get their own row dicts so the cached rows stay untouched
+        return [dict(row) for row in historical]
+
+    async def _load_historical(
+        self,
+        headers: dict,
+        today: date,
+        days: int,
+        include_activity: bool,
+    ) -> Tuple[List[dict], bool]:
+        """Fetch historical Oura data; the flag is False if an endpoint failed."""
         start_date = today - timedelta(days=days)
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # === SLEEP DATA ===
-            # Daily sleep summary (scores)
-            sleep_response = await client.get(
-                f"{self.BASE_URL}/usercollection/daily_sleep",
-                headers=headers,
-                params={"start_date": str(start_date), "end_date": str(today)}
-            )
-            sleep_data = {d.get("day"): d for d in sleep_response.json().get("data", [])}
-
-            # Detailed sleep sessions (HRV, duration breakdown, bedtime/wake)
-            detailed_sleep_response = await client.get(
-                f"{self.BASE_URL}/usercollection/sleep",
-                headers=headers,
-                params={"start_date": str(start_date), "end_date": str(today)}
-            )
-            # Index by day - prefer "long_sleep" (main sleep) over naps
-            detailed_sleep_data = {}
-            for d in detailed_sleep_response.json().get("data", []):
+        start_str, today_str = start_date.isoformat(), today.isoformat()
+        windows = _date_windows(start_date, today)
+
+        # All endpoints are independent, so fetch them concurrently. An
+        # endpoint that still fails after retries contributes no records.
+        # SpO2, stress, workout and VO2 max may not be available for all
+        # users and fall back to an empty list.
+        client = await self._get_client()
+        timeout = httpx.Timeout(30.0)
+        core_endpoints = ["daily_sleep", "sleep", "daily_readiness"]
+        if include_activity:
+            core_endpoints.append("daily_activity")
+        results = await asyncio.gather(
+            *(self._fetch_windows(client, endpoint, headers, windows, timeout) for endpoint in core_endpoints),
+            *(self._fetch_optional(client, endpoint, headers, windows, timeout) for endpoint in self.OPTIONAL_ENDPOINTS),
+            return_exceptions=True,
+        )
+        complete = not any(isinstance(r, BaseException) for r in results)
+        core_records = _records_or_raise(results[:len(core_endpoints)])
+        sleep_records, detailed_sleep_records, readiness_records = core_records[:3]
+        activity_records = core_records[3] if include_activity else []
+        spo2_records, stress_records, workout_records, vo2_records = results[len(core_endpoints):]
+
+        # Index every endpoint's records into one per-day bucket, so each
+        # list is walked once and rows are only built for days with data
+        by_day: Dict[str, Dict[str, dict]] = {}
+        for kind, records in (
+            ("sleep", sleep_records),
+            ("readiness", readiness_records),
+            ("activity", activity_records),
+            ("spo2", spo2_records),
+            ("stress", stress_records),
+            # Keep most recent workout per day
+            ("workout", workout_records),
+            ("vo2", vo2_records),
+        ):
+            for d in records:
                 day = d.get("day")
                 if day:
-                    existing = detailed_sleep_data.get(day)
-                    if not existing:
-                        detailed_sleep_data[day] = d
-                    elif d.get("type") == "long_sleep" and existing.get("type") != "long_sleep":
-                        detailed_sleep_data[day] = d
-                    elif d.get("type") == existing.get("type"):
-                        if (d.get("total_sleep_duration") or 0) > (existing.get("total_sleep_duration") or 0):
-                            detailed_sleep_data[day] = d
-
-            # === READINESS DATA ===
-            readiness_response = await client.get(
-                f"{self.BASE_URL}/usercollection/daily_readiness",
-                headers=headers,
-                params={"start_date": str(start_date), "end_date": str(today)}
-            )
-            readiness_data = {d.get("day"): d for d in readiness_response.json().get("data", [])}
-
-            # === ACTIVITY DATA ===
-            activity_response = await client.get(
-                f"{self.BASE_URL}/usercollection/daily_activity",
-                headers=headers,
-                params={"start_date": str(start_date), "end_date": str(today)}
+                    by_day.setdefault(day, {})[kind] = d
+
+        # Detailed sleep sessions (HRV, duration breakdown, bedtime/wake)
+        # Prefer "long_sleep" (main sleep) over naps
+        for d in detailed_sleep_records:
+            day = d.get("day")
+            if day:
+                bucket = by_day.setdefault(day, {})
+                if _is_preferred_session(d, bucket.get("detailed_sleep")):
+                    bucket["detailed_sleep"] = d
+
+        # Combine by date, oldest first; days no endpoint reported are omitted
+        historical = [
+            self._row_for(
+                date_str,
+                bucket.get("sleep") or _EMPTY,
+                bucket.get("detailed_sleep") or _EMPTY,
+                bucket.get("readiness") or _EMPTY,
+                bucket.get("activity") or _EMPTY,
+                bucket.get("spo2") or _EMPTY,
+                bucket.get("stress") or _EMPTY,
+                bucket.get("workout") or _EMPTY,
+                bucket.get("vo2") or _EMPTY,
             )
-            activity_data = {d.get("day"): d for d in activity_response.json().get("data", [])}
-
-            # === SPO2 DATA ===
-            spo2_data = {}
-            try:
-                spo2_response = await client.get(
-                    f"{self.BASE_URL}/usercollection/daily_spo2",
-                    headers=headers,
-                    params={"start_date": str(start_date), "end_date": str(today)}
-                )
-                if spo2_response.status_code == 200:
-                    spo2_data = {d.get("day"): d for d in spo2_response.json().get("data", [])}
-            except Exception:
-                pass  # SpO2 may not be available for all users
-
-            # === STRESS DATA ===
-            stress_data = {}
-            try:
-                stress_response = await client.get(
-                    f"{self.BASE_URL}/usercollection/daily_stress",
-                    headers=headers,
-                    params={"start_date": str(start_date), "end_date": str(today)}
-                )
-                if stress_response.status_code == 200:
-                    stress_data = {d.get("day"): d for d in stress_response.json().get("data", [])}
-            except Exception:
-                pass  # Stress may not be available
-
-            # === WORKOUT DATA ===
-            workout_data = {}
-            try:
-                workout_response = await client.get(
-                    f"{self.BASE_URL}/usercollection/workout",
-                    headers=headers,
-                    params={"start_date": str(start_date), "end_date": str(today)}
-                )
-                if workout_response.status_code == 200:
-                    # Group workouts by day, keep most recent per day
-                    for w in workout_response.json().get("data", []):
-                        day = w.get("day")
-                        if day:
-                            workout_data[day] = w
-            except Exception:
-                pass
-
-            # === VO2 MAX / HEART HEALTH ===
-            vo2_data = {}
+            for date_str, bucket in sorted(by_day.items())
+            if start_str <= date_str <= today_str
+        ]
+
+        return historical, complete
+
+    def _extract_core_metrics(self, sleep: dict, detailed_sleep: dict, readiness: dict) -> dict:
+        """Pick the NormalizedHealthData metrics out of one day's Oura records."""
+        readiness_contributors = readiness.get("contributors") or _EMPTY
+        sleep_contributors = sleep.get("contributors") or _EMPTY
+        return {
+            "sleep_score": sleep.get("score"),
+            "hrv_score": detailed_sleep.get("average_hrv"),  # Actual HRV in milliseconds
+            "recovery_score": readiness.get("score"),
+            "strain_score": self._calculate_strain_from_activity(readiness_contributors),
+            "resting_hr": readiness_contributors.get("resting_heart_rate"),
+            "sleep_duration_hrs": self._seconds_to_hours(detailed_sleep.get("total_sleep_duration")),
+            "deep_sleep_pct": sleep_contributors.get("deep_sleep"),
+            "rem_sleep_pct": sleep_contributors.get("rem_sleep"),
+        }
+
+    def _row_for(
+        self,
+        date_str: str,
+        sleep: dict,
+        detailed_sleep: dict,
+        readiness: dict,
+        activity: dict,
+        spo2: dict,
+        stress: dict,
+        workout: dict,
+        vo2: dict,
+    ) -> dict:
+        """Build one day of historical data from that day's endpoint records."""
+        # Calculate restfulness from restless periods (lower = more restful)
+        restless_periods = detailed_sleep.get("restless_periods")
+        restfulness_score = None
+        if restless_periods is not None:
+            # Typical range 0-500, normalize to 0-100 (inverted)
+            restfulness_score = max(0, min(100, 100 - int(restless_periods / 5)))
+
+        # Stress level categorization
+        stress_score = stress.get("stress_high")
+        stress_level = None
+        if stress_score is not None:
+            if stress_score < 30:
+                stress_level = "low"
+            elif stress_score < 60:
+                stress_level = "medium"
+            else:
+                stress_level = "high"
+
+        return {
+            "date": date_str,
+
+            # === Core Metrics (sleep/HRV/recovery/strain, resting HR, sleep duration and stages) ===
+            **self._extract_core_metrics(sleep, detailed_sleep, readiness),
+
+            # === Sleep Details ===
+            "deep_sleep_duration": detailed_sleep.get("deep_sleep_duration"),
+            "rem_sleep_duration": detailed_sleep.get("rem_sleep_duration"),
+            "light_sleep_duration": detailed_sleep.get("light_sleep_duration"),
+            "awake_duration": detailed_sleep.get("awake_time"),
+            "sleep_efficiency": detailed_sleep.get("efficiency"),
+            "sleep_latency": detailed_sleep.get("latency"),
+            "restfulness_score": restfulness_score,
+            "bedtime": detailed_sleep.get("bedtime_start"),
+            "wake_time": detailed_sleep.get("bedtime_end"),
+
+            # === Heart Rate ===
+            "lowest_hr": detailed_sleep.get("lowest_heart_rate"),
+            "average_hr_sleep": detailed_sleep.get("average_heart_rate"),
+
+            # === Heart Health ===
+            "vo2_max": vo2.get("vo2_max"),
+
+            # === Activity ===
+            "activity_score": activity.get("score"),
+            "steps": activity.get("steps"),
+            "active_calories": activity.get("active_calories"),
+            "total_calories": activity.get("total_calories"),
+            "sedentary_time": activity.get("sedentary_time"),
+            "active_time": (activity.get("low_activity_time") or 0) +
+                          (activity.get("medium_activity_time") or 0) +
+                          (activity.get("high_activity_time") or 0) if activity else None,
+
+            # === SpO2 / Breathing ===
+            "spo2_average": _spo2_average(spo2),
+            "breathing_average": detailed_sleep.get("average_breath"),
+            "breathing_regularity": spo2.get("breathing_disturbance_index"),
+
+            # === Stress ===
+            "stress_level": stress_level,
+            "stress_score": stress_score,
+
+            # === Workout ===
+            "workout_type": workout.get("activity") or workout.get("sport"),
+            "workout_duration": self._seconds_to_minutes(workout.get("total_duration")) if workout else None,
+            "workout_intensity": workout.get("intensity"),
+            "workout_calories": workout.get("calories"),
+            "workout_source": workout.get("source"),
+
+            # === Temperature ===
+            "temperature_deviation": readiness.get("temperature_deviation"),
+            "temperature_trend": readiness.get("temperature_trend_deviation"),
+        }
+
+    async def _fetch_records(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        headers: dict,
+        params: dict,
+        timeout=httpx.USE_CLIENT_DEFAULT,
+    ) -> List[dict]:
+        """Fetch an Oura collection endpoint, retrying transient failures with backoff.
+
+        Responses that carried an ETag are revalidated with If-None-Match, so an
+        unchanged window comes back as a bodiless 304 and the stored records are reused.
+        """
+        user_key = token_key(headers.get("Authorization"))
+        etag_key = ("oura", "etag", user_key, endpoint, tuple(sorted(params.items())))
+        validated = cache_get(etag_key)
+        if validated is not None:
+            headers = {**headers, "If-None-Match": validated[0]}
+
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            retry_after = None
+            await _throttle.acquire(user_key)
             try:
-                vo2_response = await client.get(
-                    f"{self.BASE_URL}/usercollection/vO2_max",
-                    headers=headers,
-                    params={"start_date": str(start_date), "end_date": str(today)}
-                )
-                if vo2_response.status_code == 200:
-                    vo2_data = {d.get("day"): d for d in vo2_response.json().get("data", [])}
-            except Exception:
-                pass
-
-        # Combine all data by date
-        historical = []
-        current = start_date
-        while current <= today:
-            date_str = str(current)
-            sleep = sleep_data.get(date_str, {})
-            detailed_sleep = detailed_sleep_data.get(date_str, {})
-            readiness = readiness_data.get(date_str, {})
-            activity = activity_data.get(date_str, {})
-            spo2 = spo2_data.get(date_str, {})
-            stress = stress_data.get(date_str, {})
-            workout = workout_data.get(date_str, {})
-            vo2 = vo2_data.get(date_str, {})
-
-            # Extract readiness contributors
-            readiness_contributors = readiness.get("contributors", {})
-
-            # Calculate restfulness from restless periods (lower = more restful)
-            restless_periods = detailed_sleep.get("restless_periods")
-            restfulness_score = None
-            if restless_periods is not None:
-                # Typical range 0-500, normalize to 0-100 (inverted)
-                restfulness_score = max(0, min(100, 100 - int(restless_periods / 5)))
-
-            # Stress level categorization
-            stress_score = stress.get("stress_high")
-            stress_level = None
-            if stress_score is not None:
-                if stress_score < 30:
-                    stress_level = "low"
-                elif stress_score < 60:
-                    stress_level = "medium"
+                async with _limiter.slot():
+                    response = await client.get(
+                        f"{self.BASE_URL}/usercollection/{endpoint}",
+                        headers=headers,
+                        params=params,
+                        timeout=timeout
+                    )
+            except httpx.TransportError:
+                if attempt == _MAX_ATTEMPTS:
+                    raise
+            else:
+                if response.status_code in _RETRYABLE_STATUS:
+                    _limiter.record_overload()
+                    retry_after = retry_after_seconds(response.headers.get("retry-after"), _RETRY_AFTER_MAX)
                 else:
-                    stress_level = "high"
-
-            historical.append({
-                "date": date_str,
-
-                # === Core Metrics ===
-                "sleep_score": sleep.get("score"),
-                "hrv_score": detailed_sleep.get("average_hrv"),
-                "recovery_score": readiness.get("score"),
-                "strain_score": self._calculate_strain_from_activity(readiness),
-
-                # === Sleep Details ===
-                "sleep_duration_hrs": self._seconds_to_hours(detailed_sleep.get("total_sleep_duration")),
-                "deep_sleep_duration": detailed_sleep.get("deep_sleep_duration"),
-                "rem_sleep_duration": detailed_sleep.get("rem_sleep_duration"),
-                "light_sleep_duration": detailed_sleep.get("light_sleep_duration"),
-                "awake_duration": detailed_sleep.get("awake_time"),
-                "sleep_efficiency": detailed_sleep.get("efficiency"),
-                "sleep_latency": detailed_sleep.get("latency"),
-                "restfulness_score": restfulness_score,
-                "bedtime": detailed_sleep.get("bedtime_start"),
-                "wake_time": detailed_sleep.get("bedtime_end"),
-                "deep_sleep_pct": sleep.get("contributors", {}).get("deep_sleep"),
-                "rem_sleep_pct": sleep.get("contributors", {}).get("rem_sleep"),
-
-                # === Heart Rate ===
-                "resting_hr": readiness_contributors.get("resting_heart_rate"),
-                "lowest_hr": detailed_sleep.get("lowest_heart_rate"),
-                "average_hr_sleep": detailed_sleep.get("average_heart_rate"),
-
-                # === Heart Health ===
-                "vo2_max": vo2.get("vo2_max"),
-
-                # === Activity ===
-                "activity_score": activity.get("score"),
-                "steps": activity.get("steps"),
-                "active_calories": activity.get("active_calories"),
-                "total_calories": activity.get("total_calories"),
-                "sedentary_time": activity.get("sedentary_time"),
-                "active_time": (activity.get("low_activity_time") or 0) +
-                              (activity.get("medium_activity_time") or 0) +
-                              (activity.get("high_activity_time") or 0) if activity else None,
-
-                # === SpO2 / Breathing ===
-                "spo2_average": spo2.get("spo2_percentage", {}).get("average") if isinstance(spo2.get("spo2_percentage"), dict) else spo2.get("spo2_average"),
-                "breathing_average": detailed_sleep.get("average_breath"),
-                "breathing_regularity": spo2.get("breathing_disturbance_index"),
-
-                # === Stress ===
-                "stress_level": stress_level,
-                "stress_score": stress.get("stress_high"),
-
-                # === Workout ===
-                "workout_type": workout.get("activity") or workout.get("sport"),
-                "workout_duration": self._seconds_to_minutes(workout.get("total_duration")) if workout else None,
-                "workout_intensity": workout.get("intensity"),
-                "workout_calories": workout.get("calories"),
-                "workout_source": workout.get("source"),
-
-                # === Temperature ===
-                "temperature_deviation": readiness.get("temperature_deviation"),
-                "temperature_trend": readiness.get("temperature_trend_deviation"),
-            })
-            current += timedelta(days=1)
-
-        return historical
-
-    def _seconds_to_minutes(self, seconds: Optional[int]) -> Optional[int]:
+                    _limiter.record_success()
+                if response.status_code == 304 and validated is not None:
+                    return validated[1]
+                if response.status_code not in _RETRYABLE_STATUS or attempt == _MAX_ATTEMPTS:
+                    response.raise_for_status()
+                    records = orjson.loads(response.content).get("data", [])
+                    etag = response.headers.get("etag")
+                    if etag:
+                        cache_set(etag_key, (etag, records), ttl=ETAG_CACHE_TTL)
+                    return records
+            if retry_after is not None:
+                await asyncio.sleep(retry_after + random.uniform(0, 0.3))
+            else:
+                delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    async def _fetch_windows(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        headers: dict,
+        windows: List[dict],
+        timeout=httpx.USE_CLIENT_DEFAULT,
+    ) -> List[dict]:
+        """Fetch an endpoint over several date windows concurrently, oldest records first."""
+        if len(windows) == 1:
+            return await self._fetch_records(client, endpoint, headers, windows[0], timeout)
+        chunks = await asyncio.gather(
+            *(self._fetch_records(client, endpoint, headers, params, timeout) for params in windows)
+        )
+        return [record for chunk in chunks for record in chunk]
+
+    async def _fetch_optional(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        headers: dict,
+        windows: List[dict],
+        timeout=httpx.USE_CLIENT_DEFAULT,
+    ) -> List[dict]:
+        """Fetch records from an endpoint that may not be available for every user."""
+        try:
+            return await self._fetch_windows(client, endpoint, headers, windows, timeout)
+        except Exception:
+            return []
+
+    @staticmethod
+    def _seconds_to_minutes(seconds: Optional[int]) -> Optional[int]:
         """Convert seconds to minutes."""
         if seconds is None:
             return None
@@ -376,17 +559,25 @@ class OuraIntegration(WearableIntegration):
         token = access_token.get("access_token")
         headers = {"Authorization": f"Bearer {token}"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/usercollection/personal_info",
-                headers=headers
-            )
-            if response.status_code == 200:
-                return {"connected": True, "info": response.json()}
-            elif response.status_code == 401:
-                return {"connected": False, "error": "Token expired"}
-            else:
-                return {"connected": False, "error": f"API error: {response.status_code}"}
+        # Only successful checks are remembered, so a revoked token is noticed at most a minute late
+        cache_key = ("oura", "verify", token_key(token))
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return {"connected": True, "info": cached}
+
+        client = await self._get_client()
+        response = await client.get(
+            f"{self.BASE_URL}/usercollection/personal_info",
+            headers=headers
+        )
+        if response.status_code == 200:
+            info = orjson.loads(response.content)
+            cache_set(cache_key, info, ttl=VERIFY_CACHE_TTL)
+            return {"connected": True, "info": info}
+        elif response.status_code == 401:
+            return {"connected": False, "error": "Token expired"}
+        else:
+            return {"connected": False, "error": f"API error: {response.status_code}"}
 
     def _normalize_hrv(self, hrv_balance: Optional[int]) -> Optional[float]:
         """Convert Oura's HRV balance (contributor score) to 0-100."""
@@ -394,16 +585,21 @@ class OuraIntegration(WearableIntegration):
             return None
         return float(hrv_balance)
 
-    def _calculate_strain_from_activity(self, readiness: dict) -> Optional[float]:
+    @staticmethod
+    def _calculate_strain_from_activity(readiness_contributors: dict) -> Optional[float]:
         """Estimate strain from readiness contributors."""
-        activity_balance = readiness.get("contributors", {}).get("activity_balance")
+        activity_balance = readiness_contributors.get("activity_balance")
         if activity_balance is None:
             return None
         # Higher activity balance = lower strain (inverted)
         return 100 - float(activity_balance)
 
-    def _seconds_to_hours(self, seconds: Optional[int]) -> Optional[float]:
-        """Convert seconds to hours."""
+    @staticmethod
+    def _seconds_to_hours(seconds: Optional[int]) -> Optional[float]:
+        """Convert seconds to hours, rounded half-up to one decimal."""
         if seconds is None:
             return None
+        if isinstance(seconds, int):
+            # Round in tenths of an hour (360s) using integer math
+            return (seconds * 10 + 1800) // 3600 / 10
         return round(seconds / 3600, 1)
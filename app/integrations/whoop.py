@@ -1,9 +1,21 @@
-from typing import Optional
-import httpx
+from typing import Optional, Tuple
+import asyncio
+import dataclasses
+import orjson
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 
 from app.config import get_settings
 from .base import WearableIntegration, NormalizedHealthData
+from .cache import get_or_fetch, token_key
+
+# Whoop's latest recovery/sleep/cycle only change a few times a day
+LATEST_CACHE_TTL = 300  # seconds
+
+
+def _is_complete(result: Tuple[NormalizedHealthData, bool]) -> bool:
+    """Only cache snapshots for which every endpoint answered."""
+    return result[1]
 
 
 class WhoopIntegration(WearableIntegration):
@@ -12,65 +24,68 @@ class WhoopIntegration(WearableIntegration):
     BASE_URL = "https://api.prod.whoop.com/developer/v1"
     AUTH_URL = "https://api.prod.whoop.com/oauth/oauth2/auth"
     TOKEN_URL = "https://api.prod.whoop.com/oauth/oauth2/token"
+    SCOPES = "read:recovery read:sleep read:workout"
 
     def __init__(self):
         self.settings = get_settings()
 
     def get_auth_url(self, redirect_uri: str) -> str:
         """Get Whoop OAuth authorization URL."""
-        return (
-            f"{self.AUTH_URL}"
-            f"?client_id={self.settings.whoop_client_id}"
-            f"&redirect_uri={redirect_uri}"
-            f"&response_type=code"
-            f"&scope=read:recovery+read:sleep+read:workout"
-        )
+        params = {
+            "client_id": self.settings.whoop_client_id,
+            "redirect_uri": redirect_uri,
+            "response_type": "code",
+            "scope": self.SCOPES,
+        }
+        return f"{self.AUTH_URL}?{urlencode(params)}"
 
     async def exchange_code(self, code: str, redirect_uri: str) -> dict:
         """Exchange authorization code for access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "redirect_uri": redirect_uri,
-                    "client_id": self.settings.whoop_client_id,
-                    "client_secret": self.settings.whoop_client_secret,
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        client = await self._get_client()
+        response = await client.post(
+            self.TOKEN_URL,
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": redirect_uri,
+                "client_id": self.settings.whoop_client_id,
+                "client_secret": self.settings.whoop_client_secret,
+            }
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def fetch_latest_data(self, access_token: dict) -> NormalizedHealthData:
         """Fetch and normalize the latest health data from Whoop."""
         token = access_token.get("access_token")
+        data = await get_or_fetch(
+            ("whoop", "latest", token_key(token)),
+            LATEST_CACHE_TTL,
+            lambda: self._load_latest(token),
+            cache_if=_is_complete,
+        )
+        return dataclasses.replace(data[0])
+
+    async def _load_latest(self, token: str) -> Tuple[NormalizedHealthData, bool]:
+        """Fetch the latest Whoop data; the flag is False if an endpoint failed."""
         headers = {"Authorization": f"Bearer {token}"}
+        params = {"limit": 1}
+
+        # Recovery, sleep and cycle/strain are independent, so request them concurrently
+        client = await self._get_client()
+        recovery_response, sleep_response, cycle_response = await asyncio.gather(
+            client.get(f"{self.BASE_URL}/recovery", headers=headers, params=params),
+            client.get(f"{self.BASE_URL}/activity/sleep", headers=headers, params=params),
+            client.get(f"{self.BASE_URL}/cycle", headers=headers, params=params),
+        )
 
-        async with httpx.AsyncClient() as client:
-            # Fetch recovery data
-            recovery_response = await client.get(
-                f"{self.BASE_URL}/recovery",
-                headers=headers,
-                params={"limit": 1}
-            )
-            recovery_data = recovery_response.json().get("records", [])
-
-            # Fetch sleep data
-            sleep_response = await client.get(
-                f"{self.BASE_URL}/activity/sleep",
-                headers=headers,
-                params={"limit": 1}
-            )
-            sleep_data = sleep_response.json().get("records", [])
-
-            # Fetch cycle/strain data
-            cycle_response = await client.get(
-                f"{self.BASE_URL}/cycle",
-                headers=headers,
-                params={"limit": 1}
-            )
-            cycle_data = cycle_response.json().get("records", [])
+        # A failed endpoint (401, 429, 5xx) contributes no records, and the
+        # snapshot is then returned without being cached
+        responses = (recovery_response, sleep_response, cycle_response)
+        complete = all(r.is_success for r in responses)
+        recovery_data, sleep_data, cycle_data = (
+            orjson.loads(r.content).get("records", []) if r.is_success else [] for r in responses
+        )
 
         # Extract latest values
         latest_recovery = recovery_data[0] if recovery_data else {}
@@ -78,7 +93,7 @@ class WhoopIntegration(WearableIntegration):
         latest_cycle = cycle_data[0] if cycle_data else {}
 
         # Normalize to our schema
-        return NormalizedHealthData(
+        data = NormalizedHealthData(
             sleep_score=self._calculate_sleep_score(latest_sleep),
             hrv_score=self._normalize_hrv(latest_recovery.get("score", {}).get("hrv_rmssd_milli")),
             recovery_score=latest_recovery.get("score", {}).get("recovery_score"),
@@ -96,6 +111,7 @@ class WhoopIntegration(WearableIntegration):
             source="whoop",
             timestamp=datetime.utcnow()
         )
+        return data, complete
 
     def _calculate_sleep_score(self, sleep: dict) -> Optional[float]:
         """Calculate sleep score from Whoop sleep metrics."""
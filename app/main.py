@@ -1,82 +1,146 @@
+import hashlib
 from pathlib import Path
+from urllib.parse import quote
 
-from fastapi import FastAPI, Query, Depends
+from fastapi import FastAPI, Query, Depends, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session, load_only
+from typing import Optional, Tuple
 
+from app.config import get_settings
 from app.db.database import engine, Base
 from app.db import get_db
 from app.api import users, dispenser, integrations, upload, checkins, interactions, mixes, analytics
 from app.api.mixes import blends_router
+from app.api.deps import require_admin_key
 from app.models import User
-from app.integrations import OuraIntegration
+from app.integrations import OuraIntegration, WearableIntegration
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    if get_settings().auto_create_tables:
+        # create_all is blocking; keep it off the event loop
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
     yield
+    await WearableIntegration.aclose()
 
 
 app = FastAPI(
     title="Health Platform API",
     description="AI-powered supplement recommendation engine",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson renders the large analytics and history payloads several times faster
+    default_response_class=ORJSONResponse,
 )
 
-app.include_router(users.router, prefix="/users", tags=["users"])
-app.include_router(dispenser.router, prefix="/dispense", tags=["dispenser"])
-app.include_router(integrations.router, prefix="/integrations", tags=["integrations"])
-app.include_router(upload.router, prefix="/upload", tags=["upload"])
-app.include_router(checkins.router, prefix="/checkins", tags=["checkins"])
-app.include_router(interactions.router, prefix="/interactions", tags=["interactions"])
-app.include_router(blends_router, prefix="/mixes/blends", tags=["blends"])  # Must be before mixes router
-app.include_router(mixes.router, prefix="/mixes", tags=["mixes"])
-app.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+# (router, prefix, tag) in mount order; blends must come before mixes so
+# /mixes/blends isn't captured by the mixes routes
+ROUTERS = [
+    (users.router, "/users", "users"),
+    (dispenser.router, "/dispense", "dispenser"),
+    (integrations.router, "/integrations", "integrations"),
+    (upload.router, "/upload", "upload"),
+    (checkins.router, "/checkins", "checkins"),
+    (interactions.router, "/interactions", "interactions"),
+    (blends_router, "/mixes/blends", "blends"),
+    (mixes.router, "/mixes", "mixes"),
+    (analytics.router, "/analytics", "analytics"),
+]
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers and CDNs cache assets for an hour."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        # Not immutable: assets aren't fingerprinted, so a deploy must show up within the hour
+        response.headers.setdefault("Cache-Control", "public, max-age=3600")
+        return response
+
 
 # Serve static files
 static_path = Path(__file__).resolve().parent.parent / "static"
 if static_path.exists():
-    app.mount("/static", StaticFiles(directory=static_path), name="static")
+    app.mount("/static", CachedStaticFiles(directory=static_path), name="static")
+
+
+def _read_page(name: str) -> Optional[Tuple[bytes, str]]:
+    """Read a static HTML page and its ETag once at import (pages change only on deploy)."""
+    page = static_path / name
+    if not page.is_file():
+        return None
+    body = page.read_bytes()
+    return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+def _page_response(request: Request, page: Tuple[bytes, str]) -> Response:
+    body, etag = page
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    # Revalidation after max-age expires costs a bodiless 304; the header may
+    # list several tags, weak ones included, or be "*"
+    candidates = {
+        tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")
+    }
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
+
+
+_INDEX_PAGE = _read_page("index.html")
+_PRIVACY_PAGE = _read_page("privacy.html")
+_TERMS_PAGE = _read_page("terms.html")
 
 
 @app.get("/")
-async def root():
-    index_file = static_path / "index.html"
-    if index_file.exists():
-        return FileResponse(index_file)
+async def root(request: Request):
+    if _INDEX_PAGE is not None:
+        return _page_response(request, _INDEX_PAGE)
     return {"message": "Health Platform API", "docs": "/docs"}
 
 
+_HEALTH_BODY = b'{"status":"healthy"}'
+
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    # Pre-serialized; a short max-age lets load balancers and proxies absorb frequent polling
+    return Response(
+        content=_HEALTH_BODY,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=5"},
+    )
 
 
 
 
 @app.get("/privacy")
-async def privacy_policy():
-    privacy_file = static_path / "privacy.html"
-    if privacy_file.exists():
-        return FileResponse(privacy_file)
+async def privacy_policy(request: Request):
+    if _PRIVACY_PAGE is not None:
+        return _page_response(request, _PRIVACY_PAGE)
     return {"error": "Privacy policy not found"}
 
 
 @app.get("/terms")
-async def terms_of_service():
-    terms_file = static_path / "terms.html"
-    if terms_file.exists():
-        return FileResponse(terms_file)
+async def terms_of_service(request: Request):
+    if _TERMS_PAGE is not None:
+        return _page_response(request, _TERMS_PAGE)
     return {"error": "Terms of service not found"}
 
 
 # --- Oura OAuth Routes (at /api/oura/*) ---
 
+# Stateless apart from settings; HTTP calls go through the shared client
+_oura = OuraIntegration()
+
+
 @app.get("/api/oura/auth")
 def start_oura_auth(
     user_id: str = Query(...),
@@ -86,19 +150,17 @@ def start_oura_auth(
     Start Oura OAuth flow.
     Redirects user to Oura authorization page.
     """
-    from app.config import get_settings
     settings = get_settings()
 
     if not settings.oura_client_id or not settings.oura_client_secret:
         return {"error": "Oura API credentials not configured"}
 
-    user = db.query(User).filter(User.id == user_id).first()
+    # Only existence matters here; skip loading the JSON columns
+    user = db.get(User, user_id, options=[load_only(User.id)])
     if not user:
         return {"error": "User not found"}
 
-    oura = OuraIntegration()
-    redirect_uri = "https://health-platform-production-94aa.up.railway.app/api/oura/callback"
-    auth_url = oura.get_auth_url(redirect_uri, state=user_id)
+    auth_url = _oura.get_auth_url(settings.oura_redirect_uri, state=user_id)
 
     return RedirectResponse(url=auth_url)
 
@@ -121,97 +183,117 @@ async def oura_oauth_callback(
     if not user_id:
         return RedirectResponse(url="/?oura_error=missing_user_id")
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        return RedirectResponse(url="/?oura_error=user_not_found")
-
-    oura = OuraIntegration()
-    redirect_uri = "https://health-platform-production-94aa.up.railway.app/api/oura/callback"
-
     try:
-        token = await oura.exchange_code(code, redirect_uri)
-        user.oura_token = token
-        db.commit()
+        token = await _oura.exchange_code(code, get_settings().oura_redirect_uri)
+        # One UPDATE instead of SELECT + flush. The session is synchronous, so
+        # run its round-trips in the threadpool to keep the event loop free
+        result = await run_in_threadpool(
+            db.execute, update(User).where(User.id == user_id).values(oura_token=token)
+        )
+        if result.rowcount == 0:
+            return RedirectResponse(url="/?oura_error=user_not_found")
+        await run_in_threadpool(db.commit)
         return RedirectResponse(url="/?oura_connected=true")
     except Exception as e:
-        from urllib.parse import quote
         error_msg = str(e).split('\n')[0][:80]
         return RedirectResponse(url=f"/?oura_error={quote(error_msg)}")
 
 
-@app.get("/api/migrate")
+@app.get("/api/migrate", dependencies=[Depends(require_admin_key)], include_in_schema=False)
 def run_migrations(db: Session = Depends(get_db)):
     """
     Run database migrations to add new columns.
     Safe to run multiple times - uses IF NOT EXISTS.
     """
-    from sqlalchemy import text
-
-    migrations = [
-        # Add new columns to supplement_starts table
-        "ALTER TABLE supplement_starts ADD COLUMN IF NOT EXISTS supplement_name VARCHAR",
-        "ALTER TABLE supplement_starts ADD COLUMN IF NOT EXISTS is_manual BOOLEAN DEFAULT FALSE",
-        "ALTER TABLE supplement_starts ADD COLUMN IF NOT EXISTS dosage VARCHAR",
-        "ALTER TABLE supplement_starts ADD COLUMN IF NOT EXISTS frequency VARCHAR",
-        "ALTER TABLE supplement_starts ADD COLUMN IF NOT EXISTS reason VARCHAR",
-        # Add new columns to users table for onboarding
-        "ALTER TABLE users ADD COLUMN IF NOT EXISTS health_goal VARCHAR",
-        "ALTER TABLE users ADD COLUMN IF NOT EXISTS onboarding_complete VARCHAR",
-        # Push notification fields
-        "ALTER TABLE users ADD COLUMN IF NOT EXISTS push_subscription JSONB",
-        "ALTER TABLE users ADD COLUMN IF NOT EXISTS notification_preferences JSONB DEFAULT '{}'",
-        # Stack preferences
-        "ALTER TABLE users ADD COLUMN IF NOT EXISTS afternoon_stack_enabled BOOLEAN DEFAULT FALSE",
-        # Expanded health_data columns for comprehensive Oura integration
-        # Sleep details
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS deep_sleep_duration INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS rem_sleep_duration INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS light_sleep_duration INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS awake_duration INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS sleep_efficiency INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS sleep_latency INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS restfulness_score INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS bedtime VARCHAR",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS wake_time VARCHAR",
-        # Heart rate
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS lowest_hr INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS average_hr_sleep FLOAT",
-        # Heart health
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS vo2_max FLOAT",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS cardiovascular_age INTEGER",
-        # Activity
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS activity_score INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS steps INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS active_calories INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS total_calories INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS sedentary_time INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS active_time INTEGER",
-        # SpO2 / Breathing
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS spo2_average FLOAT",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS breathing_average FLOAT",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS breathing_regularity FLOAT",
-        # Stress
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS stress_level VARCHAR",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS stress_score INTEGER",
-        # Workout
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS workout_type VARCHAR",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS workout_duration INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS workout_intensity VARCHAR",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS workout_calories INTEGER",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS workout_source VARCHAR",
-        # Temperature
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS temperature_deviation FLOAT",
-        "ALTER TABLE health_data ADD COLUMN IF NOT EXISTS temperature_trend FLOAT",
+    # Columns to add per table; each table is altered in one statement
+    migrations = {
+        "supplement_starts": [
+            # Add new columns to supplement_starts table
+            "supplement_name VARCHAR",
+            "is_manual BOOLEAN DEFAULT FALSE",
+            "dosage VARCHAR",
+            "frequency VARCHAR",
+            "reason VARCHAR",
+        ],
+        "users": [
+            # Add new columns to users table for onboarding
+            "health_goal VARCHAR",
+            "onboarding_complete VARCHAR",
+            # Push notification fields
+            "push_subscription JSONB",
+            "notification_preferences JSONB DEFAULT '{}'",
+            # Stack preferences
+            "afternoon_stack_enabled BOOLEAN DEFAULT FALSE",
+        ],
+        "health_data": [
+            # Expanded health_data columns for comprehensive Oura integration
+            # Sleep details
+            "deep_sleep_duration INTEGER",
+            "rem_sleep_duration INTEGER",
+            "light_sleep_duration INTEGER",
+            "awake_duration INTEGER",
+            "sleep_efficiency INTEGER",
+            "sleep_latency INTEGER",
+            "restfulness_score INTEGER",
+            "bedtime VARCHAR",
+            "wake_time VARCHAR",
+            # Heart rate
+            "lowest_hr INTEGER",
+            "average_hr_sleep FLOAT",
+            # Heart health
+            "vo2_max FLOAT",
+            "cardiovascular_age INTEGER",
+            # Activity
+            "activity_score INTEGER",
+            "steps INTEGER",
+            "active_calories INTEGER",
+            "total_calories INTEGER",
+            "sedentary_time INTEGER",
+            "active_time INTEGER",
+            # SpO2 / Breathing
+            "spo2_average FLOAT",
+            "breathing_average FLOAT",
+            "breathing_regularity FLOAT",
+            # Stress
+            "stress_level VARCHAR",
+            "stress_score INTEGER",
+            # Workout
+            "workout_type VARCHAR",
+            "workout_duration INTEGER",
+            "workout_intensity VARCHAR",
+            "workout_calories INTEGER",
+            "workout_source VARCHAR",
+            # Temperature
+            "temperature_deviation FLOAT",
+            "temperature_trend FLOAT",
+        ],
+    }
+
+    statements = [
+        f"ALTER TABLE {table} " + ", ".join(f"ADD COLUMN IF NOT EXISTS {column}" for column in columns)
+        for table, columns in migrations.items()
+    ]
+    # Composite indexes for per-user date-range and latest-row queries
+    statements += [
+        "CREATE INDEX IF NOT EXISTS ix_supplement_logs_user_date ON supplement_logs (user_id, log_date)",
+        "CREATE INDEX IF NOT EXISTS ix_supplement_starts_user_start ON supplement_starts (user_id, start_date)",
+        "CREATE INDEX IF NOT EXISTS ix_life_events_user_date ON life_events (user_id, event_date)",
+        "CREATE INDEX IF NOT EXISTS ix_health_data_user_ts ON health_data (user_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS ix_dispense_logs_user_at ON dispense_logs (user_id, dispensed_at)",
+        "CREATE INDEX IF NOT EXISTS ix_checkins_user_date ON daily_checkins (user_id, check_in_date)",
     ]
 
+    # One transaction and one commit; a failure rolls every table back
     results = []
-    for migration in migrations:
-        try:
-            db.execute(text(migration))
-            db.commit()
-            results.append({"sql": migration[:50] + "...", "status": "success"})
-        except Exception as e:
-            results.append({"sql": migration[:50] + "...", "status": "error", "error": str(e)})
+    try:
+        for sql in statements:
+            db.execute(text(sql))
+            results.append({"sql": sql[:50] + "...", "status": "success"})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        results = [{"sql": r["sql"], "status": "rolled_back"} for r in results]
+        results.append({"sql": sql[:50] + "...", "status": "error", "error": str(e)})
 
     return {"migrations": results}
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Date, ForeignKey, Float, Boolean, JSON
+from sqlalchemy import Column, String, DateTime, Date, ForeignKey, Float, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 import uuid
@@ -12,6 +12,8 @@ class SupplementLog(Base):
     This replaces the dispense simulation with real human behavior tracking.
     """
     __tablename__ = "supplement_logs"
+    # Analytics queries filter by user and date range; also serves user_id-only lookups
+    __table_args__ = (Index("ix_supplement_logs_user_date", "user_id", "log_date"),)
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -45,6 +47,7 @@ class SupplementStart(Base):
     Supports both app-recommended and manually-added supplements.
     """
     __tablename__ = "supplement_starts"
+    __table_args__ = (Index("ix_supplement_starts_user_start", "user_id", "start_date"),)
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -114,12 +117,17 @@ class SupplementStart(Base):
         ("deficiency", "Address Deficiency"),
     ]
 
+    @property
+    def display_name(self) -> str:
+        """Custom name if set, otherwise derived from the id (e.g. "fish_oil" -> "Fish Oil")."""
+        return self.supplement_name or self.supplement_id.replace("_", " ").title()
+
     def to_dict(self):
         return {
             "id": self.id,
             "user_id": self.user_id,
             "supplement_id": self.supplement_id,
-            "supplement_name": self.supplement_name or self.supplement_id.replace("_", " ").title(),
+            "supplement_name": self.display_name,
             "start_date": str(self.start_date),
             "end_date": str(self.end_date) if self.end_date else None,
             "notes": self.notes,
@@ -137,6 +145,7 @@ class LifeEvent(Base):
     Used as confounding factors in supplement effectiveness analysis.
     """
     __tablename__ = "life_events"
+    __table_args__ = (Index("ix_life_events_user_date", "user_id", "event_date"),)
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from operator import attrgetter
 import uuid
 
 from app.db.database import Base
@@ -49,6 +50,13 @@ class UserBaseline(Base):
     # Relationships
     user = relationship("User", back_populates="baseline")
 
+    # metric -> getter for its (mean, std) columns, resolved once rather than per call
+    _DEVIATION_METRICS = {
+        metric: attrgetter(f"{metric}_mean", f"{metric}_std")
+        for metric in ("hrv", "sleep_score", "recovery_score", "strain_score", "resting_hr", "sleep_duration")
+    }
+    _DEVIATION_STATUS = ("normal", "moderate_deviation", "significant_deviation")
+
     def to_dict(self):
         return {
             "user_id": self.user_id,
@@ -74,11 +82,13 @@ class UserBaseline(Base):
         Returns:
             dict with 'deviation_pct', 'z_score', and 'status'
         """
-        mean_attr = f"{metric}_mean"
-        std_attr = f"{metric}_std"
-
-        mean = getattr(self, mean_attr, None)
-        std = getattr(self, std_attr, None)
+        attrs = self._DEVIATION_METRICS.get(metric)
+        if attrs is not None:
+            mean, std = attrs(self)
+        else:
+            # Subjective metrics have a mean but no std column
+            mean = getattr(self, f"{metric}_mean", None)
+            std = getattr(self, f"{metric}_std", None)
 
         if mean is None or current_value is None:
             return {"deviation_pct": None, "z_score": None, "status": "unknown"}
@@ -86,13 +96,8 @@ class UserBaseline(Base):
         deviation_pct = ((current_value - mean) / mean) * 100 if mean != 0 else 0
         z_score = (current_value - mean) / std if std and std != 0 else 0
 
-        # Determine status based on z-score
-        if abs(z_score) < 1:
-            status = "normal"
-        elif abs(z_score) < 2:
-            status = "moderate_deviation"
-        else:
-            status = "significant_deviation"
+        # Status by whole standard deviations: <1 normal, <2 moderate, else significant
+        status = self._DEVIATION_STATUS[min(int(abs(z_score)), 2)]
 
         return {
             "deviation_pct": round(deviation_pct, 1),
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer, Date, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, Integer, Date, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 import uuid
@@ -9,6 +9,7 @@ from app.db.database import Base
 class DailyCheckIn(Base):
     """Daily user-reported symptoms and feelings."""
     __tablename__ = "daily_checkins"
+    __table_args__ = (Index("ix_checkins_user_date", "user_id", "check_in_date"),)
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
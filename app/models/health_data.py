@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, JSON
+from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from operator import attrgetter
 import uuid
 
 from app.db.database import Base
@@ -8,6 +9,8 @@ from app.db.database import Base
 
 class HealthData(Base):
     __tablename__ = "health_data"
+    # Latest-snapshot and date-range reads are per user, ordered by timestamp
+    __table_args__ = (Index("ix_health_data_user_ts", "user_id", "timestamp"),)
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -74,64 +77,70 @@ class HealthData(Base):
     # Relationship
     user = relationship("User", back_populates="health_data")
 
+    # to_dict keys in output order, read in one attrgetter call
+    _DICT_ATTRS = (
+        # Core metrics
+        "sleep_score",
+        "hrv_score",
+        "recovery_score",
+        "strain_score",
+        "resting_hr",
+
+        # Sleep details
+        "sleep_duration_hrs",
+        "deep_sleep_duration",
+        "rem_sleep_duration",
+        "light_sleep_duration",
+        "awake_duration",
+        "sleep_efficiency",
+        "sleep_latency",
+        "restfulness_score",
+        "bedtime",
+        "wake_time",
+        "deep_sleep_pct",
+        "rem_sleep_pct",
+
+        # Heart
+        "lowest_hr",
+        "average_hr_sleep",
+        "vo2_max",
+        "cardiovascular_age",
+
+        # Activity
+        "activity_score",
+        "steps",
+        "active_calories",
+        "total_calories",
+        "sedentary_time",
+        "active_time",
+
+        # SpO2 / Breathing
+        "spo2_average",
+        "breathing_average",
+        "breathing_regularity",
+
+        # Stress
+        "stress_level",
+        "stress_score",
+
+        # Workout
+        "workout_type",
+        "workout_duration",
+        "workout_intensity",
+        "workout_calories",
+
+        # Temperature
+        "temperature_deviation",
+        "temperature_trend",
+
+        # Meta
+        "source",
+    )
+    _get_dict_attrs = attrgetter(*_DICT_ATTRS)
+
     def to_dict(self) -> dict:
-        return {
-            # Core metrics
-            "sleep_score": self.sleep_score,
-            "hrv_score": self.hrv_score,
-            "recovery_score": self.recovery_score,
-            "strain_score": self.strain_score,
-            "resting_hr": self.resting_hr,
-
-            # Sleep details
-            "sleep_duration_hrs": self.sleep_duration_hrs,
-            "deep_sleep_duration": self.deep_sleep_duration,
-            "rem_sleep_duration": self.rem_sleep_duration,
-            "light_sleep_duration": self.light_sleep_duration,
-            "awake_duration": self.awake_duration,
-            "sleep_efficiency": self.sleep_efficiency,
-            "sleep_latency": self.sleep_latency,
-            "restfulness_score": self.restfulness_score,
-            "bedtime": self.bedtime,
-            "wake_time": self.wake_time,
-            "deep_sleep_pct": self.deep_sleep_pct,
-            "rem_sleep_pct": self.rem_sleep_pct,
-
-            # Heart
-            "lowest_hr": self.lowest_hr,
-            "average_hr_sleep": self.average_hr_sleep,
-            "vo2_max": self.vo2_max,
-            "cardiovascular_age": self.cardiovascular_age,
-
-            # Activity
-            "activity_score": self.activity_score,
-            "steps": self.steps,
-            "active_calories": self.active_calories,
-            "total_calories": self.total_calories,
-            "sedentary_time": self.sedentary_time,
-            "active_time": self.active_time,
-
-            # SpO2 / Breathing
-            "spo2_average": self.spo2_average,
-            "breathing_average": self.breathing_average,
-            "breathing_regularity": self.breathing_regularity,
-
-            # Stress
-            "stress_level": self.stress_level,
-            "stress_score": self.stress_score,
-
-            # Workout
-            "workout_type": self.workout_type,
-            "workout_duration": self.workout_duration,
-            "workout_intensity": self.workout_intensity,
-            "workout_calories": self.workout_calories,
-
-            # Temperature
-            "temperature_deviation": self.temperature_deviation,
-            "temperature_trend": self.temperature_trend,
-
-            # Meta
-            "source": self.source,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
-            "date": self.timestamp.strftime("%Y-%m-%d") if self.timestamp else None
-        }
+        d = dict(zip(self._DICT_ATTRS, self._get_dict_attrs(self)))
+        iso = self.timestamp.isoformat() if self.timestamp else None
+        d["timestamp"] = iso
+        d["date"] = iso[:10] if iso else None  # "YYYY-MM-DD" prefix of the ISO timestamp
+        return d
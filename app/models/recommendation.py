@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Float, ForeignKey, JSON
+from sqlalchemy import Column, String, DateTime, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -28,6 +28,7 @@ class Recommendation(Base):
 class DispenseLog(Base):
     """Tracks what was actually dispensed."""
     __tablename__ = "dispense_logs"
+    __table_args__ = (Index("ix_dispense_logs_user_at", "user_id", "dispensed_at"),)
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -45,14 +45,12 @@ class User(Base):
     @property
     def latitude(self) -> float:
         """Get approximate latitude based on region."""
-        if self.region and self.region in self.REGION_LATITUDES:
-            return self.REGION_LATITUDES[self.region]
-        return 39.0  # Default to US average
+        return self.REGION_LATITUDES.get(self.region, 39.0)  # Default to US average
 
     @property
     def needs_b12_boost(self) -> bool:
         """Vegetarians/vegans need more B12 supplementation."""
-        return self.diet_type in ["vegetarian", "vegan"]
+        return self.diet_type in ("vegetarian", "vegan")
 
     @property
     def needs_omega3_boost(self) -> bool:
@@ -38,25 +38,14 @@ NEW_COLUMNS = [
 ]
 
 with engine.connect() as conn:
-    # Get existing columns
-    result = conn.execute(text("""
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_name = 'users'
-    """))
-    existing_columns = [row[0] for row in result.fetchall()]
-    print(f"Existing columns: {existing_columns}")
-
-    # Add missing columns
-    for col_name, col_type in NEW_COLUMNS:
-        if col_name not in existing_columns:
-            try:
-                conn.execute(text(f"ALTER TABLE users ADD COLUMN {col_name} {col_type}"))
-                conn.commit()
-                print(f"✓ Added column: {col_name}")
-            except Exception as e:
-                print(f"✗ Error adding {col_name}: {e}")
-        else:
-            print(f"- Column already exists: {col_name}")
+    # IF NOT EXISTS makes the ALTER idempotent, so no catalog lookup is needed
+    # and every column is ensured in one statement and one commit
+    clauses = ", ".join(f"ADD COLUMN IF NOT EXISTS {col_name} {col_type}" for col_name, col_type in NEW_COLUMNS)
+    try:
+        conn.execute(text(f"ALTER TABLE users {clauses}"))
+        conn.commit()
+        print(f"✓ Ensured columns: {', '.join(col_name for col_name, _ in NEW_COLUMNS)}")
+    except Exception as e:
+        print(f"✗ Error adding columns: {e}")
 
 print("\n✅ Migration complete!")